@@ -1,80 +1,133 @@
+import asyncio
+import io
 import logging
 from pathlib import Path
-import tempfile
+from typing import Tuple
 from fastapi import APIRouter, HTTPException
 
-from cv_agent.agent import CVAnalysisAgent
+from cv_agent.agent import get_cv_analysis_agent
 from cv_agent.models import CvProcessingFinalResult
-from services.processing.schemas import CVAnalysisRequest, CVAnalysisResponse
+from services.processing.schemas import (
+    CVAnalysisRequest,
+    CVAnalysisResponse,
+    CVBatchAnalysisItem,
+    CVBatchAnalysisRequest,
+    CVBatchAnalysisResponse,
+)
 from integration import files
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/processing")
 
-agent = CVAnalysisAgent()
+# File extension used when the URL has none, by Content-Type
+CONTENT_TYPE_EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/msword": ".doc",
+    "text/plain": ".txt",
+}
 
+ALLOWED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
 
-@router.post("/analyze-cv", response_model=CVAnalysisResponse)
-async def analyze_cv(request: CVAnalysisRequest) -> CVAnalysisResponse:
-    """
-    Analyze a CV against a job description using LangGraph agent.
+# Maximum number of CVs of a batch analyzed at the same time
+BATCH_CONCURRENCY = 20
 
-    Returns:
-        CVAnalysisResponse: Structured analysis of the CV
-    """
-    try:
-        logger.info(f"Received CV analysis request for file: {request.fileUrl}")
-
-        file_response = await files.download(request.fileUrl)
 
+async def _download_cv(file_url: str) -> Tuple[io.BytesIO, str]:
+    """Download a CV into memory and resolve its file extension"""
+    async with files.stream(file_url) as file_response:
         # Determine file extension from URL or Content-Type
-        file_url_path = Path(request.fileUrl)
+        file_url_path = Path(file_url)
         file_extension = file_url_path.suffix.lower()
 
         # If no extension in URL, try to get it from Content-Type header
         if not file_extension:
             content_type = file_response.headers.get("content-type", "").lower()
-            extension_map = {
-                "application/pdf": ".pdf",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
-                "application/msword": ".doc",
-                "text/plain": ".txt",
-            }
-            file_extension = extension_map.get(content_type, ".pdf")
-
-        # Validate file type
-        allowed_extensions = [".pdf", ".docx", ".doc", ".txt"]
-        if file_extension not in allowed_extensions:
+            file_extension = CONTENT_TYPE_EXTENSIONS.get(content_type, ".pdf")
+
+        # Validate file type before the body is downloaded
+        if file_extension not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed types: {', '.join(allowed_extensions)}",
+                detail=f"Unsupported file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}",
             )
 
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=file_extension
-        ) as temp_file:
-            temp_file.write(file_response.content)
-            temp_file_path = temp_file.name
-
-        try:
-            # Run the LangGraph agent
-            logger.info("Starting CV analysis with LangGraph agent")
-            result: CvProcessingFinalResult = await agent.analyze_cv(
-                temp_file_path, request.jobDescription
-            )
+        cv_file = io.BytesIO()
+        async for chunk in file_response.aiter_bytes():
+            cv_file.write(chunk)
+        cv_file.seek(0)
 
-            logger.info(
-                f"CV analysis completed successfully for {result.full_name or 'Unknown'}"
-            )
-            return CVAnalysisResponse.model_validate(result.model_dump())
-        finally:
-            # Clean up temporary file
-            Path(temp_file_path).unlink(missing_ok=True)
+    return cv_file, file_extension
+
+
+async def _analyze_cv_file(file_url: str, job_description: str) -> CVAnalysisResponse:
+    """Download a CV and analyze it against a job description"""
+    cv_file, file_extension = await _download_cv(file_url)
+
+    # Run the LangGraph agent on the downloaded bytes, no temp file needed
+    logger.info("Starting CV analysis with LangGraph agent")
+    agent = get_cv_analysis_agent()
+    result: CvProcessingFinalResult = await agent.analyze_cv(
+        cv_file,
+        job_description,
+        file_extension,
+    )
+
+    logger.info(
+        f"CV analysis completed successfully for {result.full_name or 'Unknown'}"
+    )
+    return CVAnalysisResponse.model_validate(result, from_attributes=True)
+
+
+@router.post("/analyze-cv", response_model=CVAnalysisResponse)
+async def analyze_cv(request: CVAnalysisRequest) -> CVAnalysisResponse:
+    """
+    Analyze a CV against a job description using LangGraph agent.
+
+    Returns:
+        CVAnalysisResponse: Structured analysis of the CV
+    """
+    try:
+        logger.info(f"Received CV analysis request for file: {request.fileUrl}")
+
+        return await _analyze_cv_file(request.fileUrl, request.jobDescription)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error analyzing CV: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error analyzing CV: {str(e)}")
+
+
+@router.post("/analyze-cv-batch", response_model=CVBatchAnalysisResponse)
+async def analyze_cv_batch(request: CVBatchAnalysisRequest) -> CVBatchAnalysisResponse:
+    """
+    Analyze several CVs against one job description concurrently.
+
+    Files are downloaded and analyzed in parallel, bounded by BATCH_CONCURRENCY.
+    A failing file is reported in its own item and does not fail the batch.
+
+    Returns:
+        CVBatchAnalysisResponse: One result or error per file URL, in request order
+    """
+    logger.info(f"Received batch CV analysis request for {len(request.fileUrls)} files")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def analyze_one(file_url: str) -> CVBatchAnalysisItem:
+        async with semaphore:
+            try:
+                result = await _analyze_cv_file(file_url, request.jobDescription)
+                return CVBatchAnalysisItem(fileUrl=file_url, result=result)
+
+            except HTTPException as e:
+                return CVBatchAnalysisItem(fileUrl=file_url, error=str(e.detail))
+            except Exception as e:
+                logger.error(f"Error analyzing CV {file_url}: {str(e)}", exc_info=True)
+                return CVBatchAnalysisItem(
+                    fileUrl=file_url, error=f"Error analyzing CV: {str(e)}"
+                )
+
+    results = await asyncio.gather(*(analyze_one(url) for url in request.fileUrls))
+    return CVBatchAnalysisResponse(results=list(results))
@@ -1,8 +1,13 @@
+from typing import List
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
 
+    # Browser origins allowed to call the API, e.g. as a JSON list in
+    # CORS_ORIGINS='["https://app.example.com"]'
+    CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+
 
 settings = Settings()  # type: ignore
@@ -4,19 +4,24 @@ LangGraph agent for CV analysis.
 
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import TypedDict, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TypedDict, Dict, Any, Optional
+from functools import lru_cache
+from pathlib import Path
+import asyncio
 import json
 import logging
+import os
 
-from cv_agent.cv_parser import CVParser
+from cv_agent.cache import TTLCache, content_key
+from cv_agent.cv_parser import CVParser, CVSource
 from cv_agent.models import (
     CvAnalysisState,
     CvProcessingFinalResult,
-    Education,
     EmailTemplate,
-    Experience,
     PriorityAnalysisResponse,
     ParsedCV,
 )
@@ -25,6 +30,74 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Static prompt prefixes. They are kept byte-identical across requests and
+# placed before any per-request content so Gemini can serve them from its
+# prefix cache instead of re-processing them on every call.
+PARSE_CV_SYSTEM_PROMPT = """You are an expert CV/resume parser. Extract all relevant information from the CV text and structure it accurately.
+
+Guidelines:
+- Extract all information accurately from the CV
+- Use empty strings for missing text fields
+- Use empty arrays for missing list fields
+- For dates, use the format found in the CV (e.g., "2020", "Jan 2020", "2020-01")
+- For skills, extract both technical and soft skills
+- For summary, create a brief professional summary if not explicitly stated in the CV"""
+
+PRIORITY_SYSTEM_PROMPT = """You are an expert recruiter and talent acquisition specialist.
+Analyze the candidate's CV against the job description and determine their fit level.
+
+Priority levels:
+- "highly-recommended": Exceptional match, meets or exceeds all key requirements
+- "recommended": Good match, meets most requirements with minor gaps
+- "not-recommended": Significant gaps in key requirements
+
+Provide a 2-4 sentence explanation that will be sent directly to the candidate as feedback."""
+
+EMAIL_SYSTEM_PROMPT = """You are a professional recruiter crafting personalized email responses to job applicants.
+Generate a professional, empathetic email template based on the candidate's priority level.
+
+CRITICAL:
+- Use "FULL_NAME" as a placeholder for the candidate's name (NOT their actual name)
+- Use "AVAILABLE_SLOTS" as a placeholder for interview time slots (the recruiter will replace this later)
+
+Email guidelines:
+- Be professional, respectful, and empathetic
+- Use "FULL_NAME" placeholder (the recruiter will replace this later)
+- Use "AVAILABLE_SLOTS" placeholder when mentioning interview scheduling
+- For highly-recommended: Express enthusiasm and outline next steps
+- For recommended: Be positive but mention areas for consideration
+- For not-recommended: Be respectful and encouraging, suggest staying connected
+- Keep the tone warm but professional
+- Include clear next steps or closing statement"""
+
+EMAIL_INSTRUCTIONS = {
+    "highly-recommended": """Create an email for a HIGHLY RECOMMENDED candidate.
+
+The email should:
+- Express genuine excitement about their qualifications
+- Mention specific strengths from the feedback
+- Outline next steps in the interview process
+- Use "FULL_NAME" as placeholder for their name
+- Use "AVAILABLE_SLOTS" as placeholder when proposing interview times""",
+    "recommended": """Create an email for a RECOMMENDED candidate.
+
+The email should:
+- Show appreciation for their application
+- Acknowledge their qualifications
+- Mention next steps or timeline
+- Use "FULL_NAME" as placeholder for their name
+- Use "AVAILABLE_SLOTS" as placeholder when proposing interview times""",
+    "not-recommended": """Create an email for a NOT RECOMMENDED candidate.
+
+The email should:
+- Thank them for their interest and time
+- Be respectful and empathetic
+- Provide constructive feedback if appropriate
+- Encourage them to apply for future positions
+- Wish them well in their job search
+- Use "FULL_NAME" as placeholder for their name""",
+}
+
 
 class CVAnalysisAgent:
     """LangGraph agent for analyzing CVs against job descriptions"""
@@ -35,6 +108,13 @@ class CVAnalysisAgent:
         """
         self.cv_parser = CVParser()
 
+        # Repeated analyses of the same CV skip the LLM pipeline entirely;
+        # the same CV against a new job description still skips parsing.
+        self.result_cache: TTLCache[CvProcessingFinalResult] = TTLCache()
+        self.parsed_cv_cache: TTLCache[ParsedCV] = TTLCache()
+        # Re-uploads of the same file skip text extraction
+        self.cv_text_cache: TTLCache[str] = TTLCache()
+
         # Initialize LLM
         self.llm = ChatGoogleGenerativeAI(
             model="gemini-2.5-pro",
@@ -59,39 +139,27 @@ class CVAnalysisAgent:
         workflow.add_node("generate_email", self._generate_email)
         workflow.add_node("combine_results", self._combine_results)
 
-        workflow.set_entry_point("parse_cv")
-        workflow.add_conditional_edges(
-            "parse_cv",
-            lambda state: self._decide_next_node(state, "analyze_priority"),
-            {"analyze_priority": "analyze_priority", END: END},
-        )
+        # Parsing and the priority -> email chain only share the raw CV text,
+        # so they run as parallel branches and join before combining results.
+        workflow.add_edge(START, "parse_cv")
+        workflow.add_edge(START, "analyze_priority")
         workflow.add_edge("analyze_priority", "generate_email")
-        workflow.add_edge("generate_email", "combine_results")
+        workflow.add_edge(["parse_cv", "generate_email"], "combine_results")
         workflow.add_edge("combine_results", END)
 
         return workflow
 
-    def _decide_next_node(self, state: CvAnalysisState, nest_node: str):
-        if state["error"]:
-            return END
-        else:
-            return nest_node
-
-    async def _parse_cv(self, state: CvAnalysisState) -> CvAnalysisState:
+    async def _parse_cv(self, state: CvAnalysisState) -> Dict[str, Any]:
         """Parse CV content into structured format"""
         logger.info("Parsing CV content")
 
         cv_text = state["cv_text"]
 
-        system_prompt = """You are an expert CV/resume parser. Extract all relevant information from the CV text and structure it accurately.
-
-    Guidelines:
-    - Extract all information accurately from the CV
-    - Use empty strings for missing text fields
-    - Use empty arrays for missing list fields
-    - For dates, use the format found in the CV (e.g., "2020", "Jan 2020", "2020-01")
-    - For skills, extract both technical and soft skills
-    - For summary, create a brief professional summary if not explicitly stated in the CV"""
+        cache_key = content_key(cv_text)
+        cached_cv = self.parsed_cv_cache.get(cache_key)
+        if cached_cv is not None:
+            logger.info("Using cached parsed CV")
+            return {"parsed_cv": cached_cv}
 
         user_prompt = f"""Parse the following CV and extract all relevant information:
 
@@ -101,56 +169,36 @@ class CVAnalysisAgent:
         try:
             parsed_cv: ParsedCV = await self.structured_llm.ainvoke(
                 [
-                    SystemMessage(content=system_prompt),
+                    SystemMessage(content=PARSE_CV_SYSTEM_PROMPT),
                     HumanMessage(content=user_prompt),
                 ]
             )  # type: ignore
 
-            state["parsed_cv"] = parsed_cv
+            self.parsed_cv_cache.set(cache_key, parsed_cv)
             logger.info("CV parsed successfully")
+            return {"parsed_cv": parsed_cv}
 
         except Exception as e:
             logger.error(f"Error parsing CV: {e}")
-            state["error"] = f"Error parsing CV: {str(e)}"
-            state["parsed_cv"] = self._get_empty_cv_structure()
+            return {
+                "parsed_cv": self._get_empty_cv_structure(),
+                "error": f"Error parsing CV: {str(e)}",
+            }
 
-        return state
-
-    async def _analyze_priority(self, state: CvAnalysisState) -> CvAnalysisState:
+    async def _analyze_priority(self, state: CvAnalysisState) -> Dict[str, Any]:
         """Analyze candidate priority based on CV and job description"""
         logger.info("Analyzing candidate priority")
 
-        parsed_cv = state["parsed_cv"]
+        cv_text = state["cv_text"]
         job_description = state["job_description"]
 
-        system_prompt = """You are an expert recruiter and talent acquisition specialist. 
-        Analyze the candidate's CV against the job description and determine their fit level.
-
-    Priority levels:
-    - "highly-recommended": Exceptional match, meets or exceeds all key requirements
-    - "recommended": Good match, meets most requirements with minor gaps
-    - "not-recommended": Significant gaps in key requirements
-
-    Provide a 2-4 sentence explanation that will be sent directly to the candidate as feedback."""
-
         user_prompt = f"""Analyze this candidate against the job description:
 
     JOB DESCRIPTION:
     {job_description}
 
     CANDIDATE CV:
-    Name: {parsed_cv.full_name or "Unknown"}
-    Summary: {parsed_cv.summary or "N/A"}
-    Skills: {", ".join(parsed_cv.skills or [])}
-    Languages: {", ".join(parsed_cv.languages or [])}
-
-    Experience:
-    {self._format_experience(parsed_cv.experience or [])}
-
-    Education:
-    {self._format_education(parsed_cv.education or [])}
-
-    Certifications: {", ".join(parsed_cv.certifications or [])}
+    {cv_text}
 
     Determine the priority level and provide clear, constructive feedback."""
 
@@ -158,26 +206,26 @@ class CVAnalysisAgent:
             priority_analysis: PriorityAnalysisResponse = (
                 await self.priority_structured_llm.ainvoke(
                     [
-                        SystemMessage(content=system_prompt),
+                        SystemMessage(content=PRIORITY_SYSTEM_PROMPT),
                         HumanMessage(content=user_prompt),
                     ]
                 )
             )  # type: ignore
 
-            state["priority_analysis"] = priority_analysis
             logger.info(f"Priority analysis completed: {priority_analysis.priority}")
+            return {"priority_analysis": priority_analysis}
 
         except Exception as e:
             logger.error(f"Error analyzing priority: {e}")
-            state["priority_analysis"] = PriorityAnalysisResponse(
-                priority="not-recommended",
-                priority_description="Unable to complete analysis due to technical error.",
-            )
-            state["error"] = f"Error analyzing priority: {e}"
-
-        return state
-
-    async def _generate_email(self, state: CvAnalysisState) -> CvAnalysisState:
+            return {
+                "priority_analysis": PriorityAnalysisResponse(
+                    priority="not-recommended",
+                    priority_description="Unable to complete analysis due to technical error.",
+                ),
+                "error": f"Error analyzing priority: {e}",
+            }
+
+    async def _generate_email(self, state: CvAnalysisState) -> Dict[str, Any]:
         """Generate email template based on priority analysis"""
         logger.info("Generating email template")
 
@@ -185,90 +233,36 @@ class CVAnalysisAgent:
         job_description = state["job_description"]
         priority = priority_analysis.priority
 
-        system_prompt = """You are a professional recruiter crafting personalized email responses to job applicants. 
-    Generate a professional, empathetic email template based on the candidate's priority level.
-
-    CRITICAL: 
-    - Use "FULL_NAME" as a placeholder for the candidate's name (NOT their actual name)
-    - Use "AVAILABLE_SLOTS" as a placeholder for interview time slots (the recruiter will replace this later)
-
-    Email guidelines:
-    - Be professional, respectful, and empathetic
-    - Use "FULL_NAME" placeholder (the recruiter will replace this later)
-    - Use "AVAILABLE_SLOTS" placeholder when mentioning interview scheduling
-    - For highly-recommended: Express enthusiasm and outline next steps
-    - For recommended: Be positive but mention areas for consideration
-    - For not-recommended: Be respectful and encouraging, suggest staying connected
-    - Keep the tone warm but professional
-    - Include clear next steps or closing statement"""
-
-        if priority == "highly-recommended":
-            user_prompt = f"""Create an email for a HIGHLY RECOMMENDED candidate.
-
-    Job Description (for context):
-    {job_description}
-
-    Feedback: {priority_analysis.priority_description}
-
-    The email should:
-    - Express genuine excitement about their qualifications
-    - Mention specific strengths from the feedback
-    - Outline next steps in the interview process
-    - Use "FULL_NAME" as placeholder for their name
-    - Use "AVAILABLE_SLOTS" as placeholder when proposing interview times"""
-
-        elif priority == "recommended":
-            user_prompt = f"""Create an email for a RECOMMENDED candidate.
-
-    Job Description (for context):
-    {job_description}
-
-    Feedback: {priority_analysis.priority_description}
-
-    The email should:
-    - Show appreciation for their application
-    - Acknowledge their qualifications
-    - Mention next steps or timeline
-    - Use "FULL_NAME" as placeholder for their name
-    - Use "AVAILABLE_SLOTS" as placeholder when proposing interview times"""
-
-        else:
-            user_prompt = f"""Create an email for a NOT RECOMMENDED candidate.
-
-    Job Description (for context):
+        # The job description leads the message so the prefix shared by every
+        # candidate of the same vacancy stays identical across requests.
+        user_prompt = f"""Job Description (for context):
     {job_description}
 
     Feedback: {priority_analysis.priority_description}
 
-    The email should:
-    - Thank them for their interest and time
-    - Be respectful and empathetic
-    - Provide constructive feedback if appropriate
-    - Encourage them to apply for future positions
-    - Wish them well in their job search
-    - Use "FULL_NAME" as placeholder for their name"""
+    {EMAIL_INSTRUCTIONS[priority]}"""
 
         try:
             email_template: EmailTemplate = await self.email_structured_llm.ainvoke(
                 [
-                    SystemMessage(content=system_prompt),
+                    SystemMessage(content=EMAIL_SYSTEM_PROMPT),
                     HumanMessage(content=user_prompt),
                 ]
             )  # type: ignore
 
-            state["email_template"] = email_template
             logger.info("Email template generated successfully")
+            return {"email_template": email_template}
 
         except Exception as e:
             logger.error(f"Error generating email: {e}")
-            state["email_template"] = EmailTemplate(
-                subject="Thank you for your application",
-                body="Dear FULL_NAME,\n\nThank you for your interest in our position.\n\nBest regards",
-            )
-
-        return state
+            return {
+                "email_template": EmailTemplate(
+                    subject="Thank you for your application",
+                    body="Dear FULL_NAME,\n\nThank you for your interest in our position.\n\nBest regards",
+                )
+            }
 
-    def _combine_results(self, state: CvAnalysisState) -> CvAnalysisState:
+    def _combine_results(self, state: CvAnalysisState) -> Dict[str, Any]:
         """Combine parsed CV and priority analysis into final result"""
         logger.info("Combining results")
 
@@ -276,66 +270,93 @@ class CVAnalysisAgent:
         priority_analysis = state["priority_analysis"]
         email_template = state.get("email_template", EmailTemplate(subject="", body=""))
 
-        final_result = CvProcessingFinalResult(
-            **parsed_cv.model_dump(),
-            **priority_analysis.model_dump(),
+        # The parts were validated when produced and are immutable, so they
+        # can be shared with the final result without copying or revalidating
+        final_result = CvProcessingFinalResult.model_construct(
+            **dict(parsed_cv),
+            **dict(priority_analysis),
             email_response_example=email_template,
         )
 
-        state["final_result"] = final_result
-        return state
+        return {"final_result": final_result}
 
-    def _format_experience(self, experience_list: List[Experience]) -> str:
-        """Format experience list for prompt"""
-        if not experience_list:
-            return "No experience listed"
+    def _get_empty_cv_structure(self) -> ParsedCV:
+        """Return empty CV structure"""
+        return ParsedCV()
 
-        formatted = []
-        for exp in experience_list:
-            formatted.append(
-                f"- {exp.job_title or 'N/A'} at {exp.company or 'N/A'} "
-                f"({exp.start_date or 'N/A'} - {exp.end_date or 'N/A'})"
+    async def _extract_text(
+        self, cv_file: CVSource, file_extension: Optional[str]
+    ) -> str:
+        """Extract CV text, reusing the text of a file with identical content"""
+        if isinstance(cv_file, str):
+            path = Path(cv_file)
+            content = path.read_bytes() if path.is_file() else None
+            file_extension = file_extension or path.suffix
+        else:
+            content = cv_file.read()
+            cv_file.seek(0)
+
+        cache_key = None
+        if content is not None:
+            cache_key = content_key(content, (file_extension or "").lower())
+            cached_text = self.cv_text_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("Using cached CV text")
+                return cached_text
+
+        # Text extraction is CPU-bound: run it in a worker process so it does
+        # not block the event loop and concurrent CVs parse on separate cores
+        loop = asyncio.get_running_loop()
+        pool = _get_parser_pool()
+        try:
+            cv_text = await loop.run_in_executor(
+                pool, self.cv_parser.extract_text, cv_file, file_extension
             )
-        return "\n".join(formatted)
-
-    def _format_education(self, education_list: List[Education]) -> str:
-        """Format education list for prompt"""
-        if not education_list:
-            return "No education listed"
-
-        formatted = []
-        for edu in education_list:
-            formatted.append(
-                f"- {edu.degree or 'N/A'} in {edu.field or 'N/A'} "
-                f"from {edu.institution or 'N/A'} "
-                f"({edu.start_year or 'N/A'} - {edu.end_year or 'N/A'})"
+        except BrokenProcessPool:
+            # A dead worker (e.g. a native PDFium crash or an OOM kill) breaks
+            # the whole pool; replace it and retry once
+            logger.warning("CV parser pool is broken, restarting it")
+            _reset_parser_pool(pool)
+            cv_text = await loop.run_in_executor(
+                _get_parser_pool(), self.cv_parser.extract_text, cv_file, file_extension
             )
-        return "\n".join(formatted)
 
-    def _get_empty_cv_structure(self) -> ParsedCV:
-        """Return empty CV structure"""
-        return ParsedCV()
+        if cache_key is not None:
+            self.cv_text_cache.set(cache_key, cv_text)
+
+        return cv_text
 
     async def analyze_cv(
-        self, cv_file_path: str, job_description: str
+        self,
+        cv_file: CVSource,
+        job_description: str,
+        file_extension: Optional[str] = None,
     ) -> CvProcessingFinalResult:
         """
         Analyze a CV against a job description.
 
         Args:
-            cv_file_path: Path to the CV file
+            cv_file: Path to the CV file or a binary stream with its content
             job_description: Job description text
+            file_extension: CV file extension, required when cv_file is a stream
 
         Returns:
             Dictionary containing the structured CV analysis
         """
-        logger.info(f"Starting CV analysis for file: {cv_file_path}")
+        logger.info("Starting CV analysis")
 
-        cv_text = self.cv_parser.extract_text(cv_file_path)
+        cv_text = await self._extract_text(cv_file, file_extension)
 
         if not cv_text or len(cv_text.strip()) < 50:
             raise ValueError("CV file is empty or could not be read properly")
 
+        # Whitespace-only differences in the job description hit the same entry
+        cache_key = content_key(cv_text, " ".join(job_description.split()))
+        cached_result = self.result_cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("Returning cached CV analysis result")
+            return cached_result
+
         initial_state: CvAnalysisState = {
             "cv_text": cv_text,
             "job_description": job_description,
@@ -352,5 +373,38 @@ class CVAnalysisAgent:
 
         if final_state.get("error"):
             logger.error(f"Error in workflow: {final_state['error']}")
+        else:
+            self.result_cache.set(cache_key, final_state["final_result"])
 
         return final_state["final_result"]
+
+
+@lru_cache(maxsize=1)
+def _get_parser_pool() -> ProcessPoolExecutor:
+    """Return the process pool used for CV text extraction, created on first use"""
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _reset_parser_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """Drop a broken parser pool so the next caller gets a fresh one"""
+    if _get_parser_pool() is broken_pool:
+        _get_parser_pool.cache_clear()
+    broken_pool.shutdown(wait=False)
+
+
+def shutdown_parser_pool() -> None:
+    """Stop the CV parser worker processes (called on application shutdown)"""
+    if _get_parser_pool.cache_info().currsize:
+        _get_parser_pool().shutdown(cancel_futures=True)
+        _get_parser_pool.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_cv_analysis_agent() -> CVAnalysisAgent:
+    """
+    Return the process-wide CV Analysis Agent.
+
+    The agent and its compiled workflow are built on first use and shared by
+    every caller in the process (API routes, LangGraph Studio).
+    """
+    return CVAnalysisAgent()
@@ -2,24 +2,43 @@
 CV Parser utility for extracting text from various file formats.
 """
 
+import codecs
 import logging
 from pathlib import Path
-import PyPDF2
+from typing import BinaryIO, Optional, Union
+import pypdfium2 as pdfium
 from docx import Document
+from docx.oxml.ns import qn
 
 logger = logging.getLogger(__name__)
 
+CVSource = Union[str, BinaryIO]
+
+# Encodings announced by a byte order mark, longest marks first
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Encodings tried in order for text without a byte order mark
+TEXT_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
 
 class CVParser:
     """Utility class for parsing CV files of different formats"""
 
     @staticmethod
-    def extract_text(file_path: str) -> str:
+    def extract_text(source: CVSource, extension: Optional[str] = None) -> str:
         """
         Extract text from CV file based on its extension.
 
         Args:
-            file_path: Path to the CV file
+            source: Path to the CV file or a binary stream with its content
+            extension: File extension (e.g. ".pdf"); required for streams,
+                taken from the path when omitted
 
         Returns:
             Extracted text content
@@ -27,43 +46,57 @@ class CVParser:
         Raises:
             ValueError: If file format is not supported or file cannot be read
         """
-        path = Path(file_path)
+        if isinstance(source, str):
+            path = Path(source)
 
-        if not path.exists():
-            raise ValueError(f"File not found: {file_path}")
+            if not path.exists():
+                raise ValueError(f"File not found: {source}")
 
-        extension = path.suffix.lower()
+            extension = extension or path.suffix
+        elif not extension:
+            raise ValueError("File extension is required to read a CV stream")
+
+        extension = extension.lower()
 
         try:
             if extension == ".pdf":
-                return CVParser._extract_from_pdf(file_path)
+                return CVParser._extract_from_pdf(source)
             elif extension in [".docx", ".doc"]:
-                return CVParser._extract_from_docx(file_path)
+                return CVParser._extract_from_docx(source)
             elif extension == ".txt":
-                return CVParser._extract_from_txt(file_path)
+                return CVParser._extract_from_txt(source)
             else:
                 raise ValueError(f"Unsupported file format: {extension}")
         except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {e}")
+            logger.error(f"Error extracting text from {_describe(source)}: {e}")
             raise ValueError(f"Failed to extract text from file: {str(e)}")
 
     @staticmethod
-    def _extract_from_pdf(file_path: str) -> str:
+    def _extract_from_pdf(source: CVSource) -> str:
         """Extract text from PDF file"""
-        logger.info(f"Extracting text from PDF: {file_path}")
+        logger.info(f"Extracting text from PDF: {_describe(source)}")
 
         text_content = []
 
         try:
-            with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            # PDFium reads files natively and loads bytes straight from memory;
+            # a stream would instead be pulled through Python read callbacks
+            pdf = pdfium.PdfDocument(
+                source if isinstance(source, str) else source.read()
+            )
 
+            try:
                 # Extract text from each page
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
+                for page_num in range(len(pdf)):
+                    page = pdf[page_num]
+                    text_page = page.get_textpage()
+                    text = text_page.get_text_range()
+                    text_page.close()
+                    page.close()
                     if text:
-                        text_content.append(text)
+                        text_content.append(text.replace("\r\n", "\n"))
+            finally:
+                pdf.close()
 
             full_text = "\n\n".join(text_content)
 
@@ -78,25 +111,20 @@ class CVParser:
             raise ValueError(f"Failed to read PDF file: {str(e)}")
 
     @staticmethod
-    def _extract_from_docx(file_path: str) -> str:
+    def _extract_from_docx(source: CVSource) -> str:
         """Extract text from DOCX file"""
-        logger.info(f"Extracting text from DOCX: {file_path}")
+        logger.info(f"Extracting text from DOCX: {_describe(source)}")
 
         try:
-            doc = Document(file_path)
+            doc = Document(source)
 
-            # Extract text from paragraphs
+            # Walk the XML once instead of python-docx's paragraph/table/cell
+            # wrappers; table cells are picked up in document order
             text_content = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text)
-
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text_content.append(cell.text)
+            for paragraph in doc.element.body.iter(qn("w:p")):
+                text = _paragraph_text(paragraph)
+                if text.strip():
+                    text_content.append(text)
 
             full_text = "\n\n".join(text_content)
 
@@ -111,32 +139,55 @@ class CVParser:
             raise ValueError(f"Failed to read DOCX file: {str(e)}")
 
     @staticmethod
-    def _extract_from_txt(file_path: str) -> str:
+    def _extract_from_txt(source: CVSource) -> str:
         """Extract text from TXT file"""
-        logger.info(f"Extracting text from TXT: {file_path}")
+        logger.info(f"Extracting text from TXT: {_describe(source)}")
 
         try:
-            # Try different encodings
-            encodings = ["utf-8", "latin-1", "cp1252"]
-
-            for encoding in encodings:
-                try:
-                    with open(file_path, "r", encoding=encoding) as file:
-                        text = file.read()
-
-                        if not text.strip():
-                            raise ValueError("TXT file is empty")
+            if isinstance(source, str):
+                raw = Path(source).read_bytes()
+            else:
+                raw = source.read()
 
-                        logger.info(
-                            f"Successfully extracted {len(text)} characters from TXT"
-                        )
-                        return text
+            text = _decode_text(raw)
 
-                except UnicodeDecodeError:
-                    continue
+            if not text.strip():
+                raise ValueError("TXT file is empty")
 
-            raise ValueError("Failed to decode text file with supported encodings")
+            logger.info(f"Successfully extracted {len(text)} characters from TXT")
+            return text
 
         except Exception as e:
             logger.error(f"Error reading TXT: {e}")
             raise ValueError(f"Failed to read TXT file: {str(e)}")
+
+
+def _paragraph_text(paragraph) -> str:
+    """Text of a w:p element, with tabs and line breaks kept as in Paragraph.text"""
+    # Runs inside a text box belong to the text box's own w:p, which the
+    # body walk visits separately
+    return "".join(
+        run.text
+        for run in paragraph.iter(qn("w:r"))
+        if next(run.iterancestors(qn("w:p"))) is paragraph
+    )
+
+
+def _describe(source: CVSource) -> str:
+    """Describe a CV source for log messages"""
+    return source if isinstance(source, str) else "in-memory file"
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode text file content, honouring a byte order mark if present"""
+    for bom, encoding in TEXT_BOMS:
+        if raw.startswith(bom):
+            return raw.decode(encoding)
+
+    for encoding in TEXT_ENCODINGS:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+
+    raise ValueError("Failed to decode text file with supported encodings")
@@ -0,0 +1,62 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, TypedDict
+
+from langchain.agents import create_agent
+from langchain.agents.middleware import ModelRequest, dynamic_prompt
+from langchain_core.tools import BaseTool
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from cv_agent.cache import TTLCache
+
+
+class AgentContext(TypedDict):
+    """Per-call values passed to a cached agent."""
+
+    system_prompt: str
+
+
+@dynamic_prompt
+def _system_prompt_from_context(request: ModelRequest) -> str:
+    """Use the system prompt of the current call, not one baked into the agent"""
+    return request.runtime.context["system_prompt"]
+
+
+@lru_cache(maxsize=8)
+def get_llm(model: str, temperature: float) -> ChatGoogleGenerativeAI:
+    """Return a shared Gemini client for a model and temperature"""
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+
+# Compiled agents keyed by tool identity, schema and model settings. The
+# tools are kept alongside each agent so their ids cannot be reused while
+# the entry is cached.
+_agents: TTLCache[Tuple[List[BaseTool], Any]] = TTLCache(maxsize=32)
+
+
+def get_agent(
+    tools: List[BaseTool],
+    model: str,
+    temperature: float,
+    response_format: Optional[type] = None,
+) -> Any:
+    """
+    Return a compiled agent for the given MCP tools, building it on first use.
+
+    The system prompt is rendered per call and passed as the agent context:
+    agent.ainvoke(input, context=AgentContext(system_prompt=...))
+    """
+    cache_key = (tuple(map(id, tools)), model, temperature, response_format)
+    cached = _agents.get(cache_key)
+    if cached is not None:
+        return cached[1]
+
+    agent = create_agent(
+        get_llm(model, temperature),
+        tools,
+        middleware=[_system_prompt_from_context],
+        response_format=response_format,
+        context_schema=AgentContext,
+    )
+    _agents.set(cache_key, (tools, agent))
+
+    return agent
@@ -1,15 +1,24 @@
+import asyncio
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
+from itertools import groupby
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from cv_agent.mcp.g_calendar import get_calendar_events
-from cv_agent.mcp.schemas import CalendarEvent
+from cv_agent.mcp.schemas import CalendarEvent, CalendarEventsResponse
 
 logger = logging.getLogger(__name__)
 
+# Ordinal suffix (1st, 2nd, 3rd, 4th, etc.) indexed by day of month
+ORDINAL_SUFFIXES = tuple(
+    "th" if 10 <= day % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    for day in range(32)
+)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class AvailabilityConstraints:
     """Constraints for recruiter availability."""
 
@@ -30,7 +39,7 @@ class AvailabilityConstraints:
     setup_time_minutes: int = 5  # Time before meeting to prepare
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeSlot:
     """Represents a time slot."""
 
@@ -61,6 +70,19 @@ class RecruiterAvailabilityChecker:
     def __init__(self, constraints: Optional[AvailabilityConstraints] = None):
         self.constraints = constraints or AvailabilityConstraints()
 
+        # Constraint bounds as seconds since midnight for the slot search;
+        # constraints are frozen, so these never go stale
+        self._latest_end_s = _seconds_of_day(self.constraints.latest_meeting_end)
+        self._lunch_start_s = _seconds_of_day(self.constraints.lunch_break_start)
+        self._lunch_end_s = _seconds_of_day(self.constraints.lunch_break_end)
+        self._duration_s = self.constraints.meeting_duration_minutes * 60
+        self._step_s = (
+            self._duration_s + self.constraints.min_break_between_meetings * 60
+        )
+        self._min_break = timedelta(
+            minutes=self.constraints.min_break_between_meetings
+        )
+
     async def get_available_slots_str(
         self,
         recruiter_email: str,
@@ -144,6 +166,7 @@ class RecruiterAvailabilityChecker:
 
         # Try to select one from each category on different days
         selected_slots = []
+        selected_set = set()
         used_dates = set()
 
         # Priority: morning, midday, afternoon
@@ -157,6 +180,7 @@ class RecruiterAvailabilityChecker:
 
                 if slot_date not in used_dates:
                     selected_slots.append(slot)
+                    selected_set.add(slot)
                     used_dates.add(slot_date)
                     break
 
@@ -170,6 +194,7 @@ class RecruiterAvailabilityChecker:
 
                 if slot_date not in used_dates:
                     selected_slots.append(slot)
+                    selected_set.add(slot)
                     used_dates.add(slot_date)
 
         # If we still need more slots, just add the next available ones
@@ -178,8 +203,9 @@ class RecruiterAvailabilityChecker:
                 if len(selected_slots) >= num_slots:
                     break
 
-                if slot not in selected_slots:
+                if slot not in selected_set:
                     selected_slots.append(slot)
+                    selected_set.add(slot)
 
         # Sort by date and time
         selected_slots.sort(key=lambda s: s.start)
@@ -220,21 +246,16 @@ class RecruiterAvailabilityChecker:
 
         for slot in slots:
             # Format: "Monday, December 2nd at 10:00 AM - 10:45 AM"
-            day_name = slot.start.strftime("%A")
-            month_name = slot.start.strftime("%B")
+            day_name, month_name, start_time = slot.start.strftime(
+                "%A|%B|%I:%M %p"
+            ).split("|")
             day_num = slot.start.day
 
-            # Add ordinal suffix (1st, 2nd, 3rd, 4th, etc.)
-            if 10 <= day_num % 100 <= 20:
-                suffix = "th"
-            else:
-                suffix = {1: "st", 2: "nd", 3: "rd"}.get(day_num % 10, "th")
-
-            start_time = slot.start.strftime("%I:%M %p").lstrip("0")
+            start_time = start_time.lstrip("0")
             end_time = slot.end.strftime("%I:%M %p").lstrip("0")
 
             formatted_line = (
-                f"- {day_name}, {month_name} {day_num}{suffix} "
+                f"- {day_name}, {month_name} {day_num}{ORDINAL_SUFFIXES[day_num]} "
                 f"at {start_time} - {end_time}"
             )
 
@@ -265,8 +286,37 @@ class RecruiterAvailabilityChecker:
             f"from {start_date} to {end_date}"
         )
 
+        busy_slots_by_date = await self._get_busy_slots_by_date(
+            recruiter_email=recruiter_email,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        available_slots_by_date = dict(
+            self._iter_available_slots(
+                busy_slots_by_date=busy_slots_by_date,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
+
+        logger.info(
+            f"Found {sum(len(slots) for slots in available_slots_by_date.values())} "
+            f"available slots across {len(available_slots_by_date)} days"
+        )
+
+        return available_slots_by_date
+
+    async def _get_busy_slots_by_date(
+        self,
+        recruiter_email: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[date, List[TimeSlot]]:
+        """Fetch recruiter's busy slots, sorted by start time and grouped by day."""
+
         # Get recruiter's calendar events
-        calendar_response = await get_calendar_events(
+        calendar_response = await _get_calendar_events_for_days(
             user_email=recruiter_email,
             start_time=start_date,
             end_time=end_date,
@@ -275,36 +325,41 @@ class RecruiterAvailabilityChecker:
         # Parse existing events into TimeSlot objects
         busy_slots = self._parse_calendar_events(calendar_response.events)
 
-        # Generate available slots for each day
-        available_slots_by_date = {}
+        # Sort once and bucket by day; each day's slots stay sorted
+        busy_slots.sort(key=lambda slot: slot.start)
+        return {
+            slot_date: list(slots)
+            for slot_date, slots in groupby(busy_slots, key=lambda s: s.start.date())
+        }
+
+    def _iter_available_slots(
+        self,
+        busy_slots_by_date: Dict[date, List[TimeSlot]],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Iterator[Tuple[str, List[TimeSlot]]]:
+        """
+        Yield (date string, available slots) for each day with availability.
+
+        Days are yielded in chronological order and computed lazily, so callers
+        that only need the earliest slots can stop early.
+        """
+
         current_date = start_date.date()
         end = end_date.date()
 
         while current_date <= end:
-            # Get busy slots for this specific day
-            day_busy_slots = [
-                slot for slot in busy_slots if slot.start.date() == current_date
-            ]
-
             # Find available slots for this day
             day_available_slots = self._find_available_slots_for_day(
                 date=current_date,
-                busy_slots=day_busy_slots,
+                busy_slots=busy_slots_by_date.get(current_date, []),
             )
 
             if day_available_slots:
-                date_str = current_date.strftime("%Y-%m-%d")
-                available_slots_by_date[date_str] = day_available_slots
+                yield current_date.strftime("%Y-%m-%d"), day_available_slots
 
             current_date += timedelta(days=1)
 
-        logger.info(
-            f"Found {sum(len(slots) for slots in available_slots_by_date.values())} "
-            f"available slots across {len(available_slots_by_date)} days"
-        )
-
-        return available_slots_by_date
-
     def _parse_calendar_events(self, events: List[CalendarEvent]) -> List[TimeSlot]:
         """Parse calendar events into TimeSlot objects."""
 
@@ -312,14 +367,11 @@ class RecruiterAvailabilityChecker:
 
         for event in events:
             try:
-                # Parse ISO format datetime strings
-                start = datetime.fromisoformat(event.start_time.replace("Z", "+00:00"))
-                end = datetime.fromisoformat(event.end_time.replace("Z", "+00:00"))
-
-                # Convert to local time if needed
+                # Parse ISO format datetime strings; fromisoformat accepts a
+                # trailing "Z" natively, so the strings are not rewritten first.
                 # For simplicity, assuming times are already in correct timezone
-                start = start.replace(tzinfo=None)
-                end = end.replace(tzinfo=None)
+                start = datetime.fromisoformat(event.start_time).replace(tzinfo=None)
+                end = datetime.fromisoformat(event.end_time).replace(tzinfo=None)
 
                 busy_slots.append(TimeSlot(start=start, end=end))
 
@@ -337,6 +389,8 @@ class RecruiterAvailabilityChecker:
         """
         Find available time slots for a specific day.
 
+        busy_slots must be sorted by start time.
+
         Considers:
         - Working hours (10:00 - 18:00)
         - Lunch break (13:00 - 14:00)
@@ -354,15 +408,14 @@ class RecruiterAvailabilityChecker:
         lunch_end = datetime.combine(date, self.constraints.lunch_break_end)
         lunch_break = TimeSlot(start=lunch_start, end=lunch_end)
 
-        # Add lunch break to busy slots
-        all_busy_slots = busy_slots + [lunch_break]
-
-        # Sort busy slots by start time
-        all_busy_slots.sort(key=lambda slot: slot.start)
+        # Add lunch break to busy slots, which are already sorted by start time
+        all_busy_slots = list(busy_slots)
+        insort(all_busy_slots, lunch_break, key=lambda slot: slot.start)
 
         # Find free time windows
         available_slots = []
         current_time = day_start
+        min_break = self._min_break
 
         for busy_slot in all_busy_slots:
             # If there's a gap before this busy slot
@@ -375,9 +428,7 @@ class RecruiterAvailabilityChecker:
                 available_slots.extend(free_slots)
 
             # Move current time to end of busy slot + minimum break
-            current_time = busy_slot.end + timedelta(
-                minutes=self.constraints.min_break_between_meetings
-            )
+            current_time = busy_slot.end + min_break
 
         # Check for slots after the last busy period
         if current_time < day_end:
@@ -408,36 +459,32 @@ class RecruiterAvailabilityChecker:
             List of possible meeting slots
         """
 
-        slots = []
-        meeting_duration = timedelta(minutes=self.constraints.meeting_duration_minutes)
-
-        # Start from the beginning of the window
-        current_start = window_start
-
-        while True:
-            # Calculate when this meeting would end
-            meeting_end = current_start + meeting_duration
+        # Work in whole seconds since midnight and only build datetimes for
+        # the slots that are kept
+        midnight = datetime.combine(window_start.date(), time(0, 0))
+        window_start_s = _seconds_since(midnight, window_start)
+        window_end_s = _seconds_since(midnight, window_end)
 
-            # Check if meeting would end after day ends
-            if meeting_end.time() > self.constraints.latest_meeting_end:
-                break
+        duration_s = self._duration_s
+        lunch_start_s = self._lunch_start_s
+        lunch_end_s = self._lunch_end_s
 
-            # Check if meeting fits in the window
-            if meeting_end > window_end:
-                break
+        # A meeting must end within both the window and the working day
+        last_start_s = min(window_end_s, self._latest_end_s) - duration_s
 
-            # Check if meeting overlaps with lunch break
-            slot = TimeSlot(start=current_start, end=meeting_end)
-            lunch_start = self.constraints.lunch_break_start
-            lunch_end = self.constraints.lunch_break_end
+        slots = []
+        for start_s in range(window_start_s, last_start_s + 1, self._step_s):
+            end_s = start_s + duration_s
 
             # Skip if slot contains lunch break
-            if not (slot.contains_time(lunch_start) or slot.contains_time(lunch_end)):
-                slots.append(slot)
+            if start_s <= lunch_start_s < end_s or start_s <= lunch_end_s < end_s:
+                continue
 
-            # Move to next possible slot (with minimum break)
-            current_start = meeting_end + timedelta(
-                minutes=self.constraints.min_break_between_meetings
+            slots.append(
+                TimeSlot(
+                    start=midnight + timedelta(seconds=start_s),
+                    end=midnight + timedelta(seconds=end_s),
+                )
             )
 
         return slots
@@ -462,7 +509,7 @@ class RecruiterAvailabilityChecker:
         day_start = datetime.combine(proposed_slot.start.date(), time(0, 0))
         day_end = day_start + timedelta(days=1)
 
-        calendar_response = await get_calendar_events(
+        calendar_response = await _get_calendar_events_for_days(
             user_email=recruiter_email,
             start_time=day_start,
             end_time=day_end,
@@ -470,9 +517,14 @@ class RecruiterAvailabilityChecker:
 
         busy_slots = self._parse_calendar_events(calendar_response.events)
 
-        # Check if proposed slot overlaps with any busy slot
-        for busy_slot in busy_slots:
-            if proposed_slot.overlaps_with(busy_slot):
+        # Check if proposed slot overlaps with any busy slot; only slots that
+        # start before the proposed one ends can overlap it
+        busy_slots.sort(key=lambda slot: slot.start)
+        candidates = bisect_left(
+            busy_slots, proposed_slot.end, key=lambda slot: slot.start
+        )
+        for busy_slot in busy_slots[:candidates]:
+            if busy_slot.end > proposed_slot.start:
                 return False
 
         # Check constraints
@@ -553,17 +605,19 @@ class RecruiterAvailabilityChecker:
 
         end_date = from_date + timedelta(days=max_days_ahead)
 
-        available_slots = await self.get_available_slots(
+        busy_slots_by_date = await self._get_busy_slots_by_date(
             recruiter_email=recruiter_email,
             start_date=from_date,
             end_date=end_date,
         )
 
-        # Get earliest slot
-        for date_str in sorted(available_slots.keys()):
-            slots = available_slots[date_str]
-            if slots:
-                return slots[0]
+        # Days are generated in order, so stop at the first one with a slot
+        for _, slots in self._iter_available_slots(
+            busy_slots_by_date=busy_slots_by_date,
+            start_date=from_date,
+            end_date=end_date,
+        ):
+            return slots[0]
 
         return None
 
@@ -611,3 +665,64 @@ class RecruiterAvailabilityChecker:
                 "max_meetings_per_day": self.constraints.max_meetings_per_day,
             },
         }
+
+    async def get_available_slots_summary_many(
+        self,
+        recruiter_emails: List[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Dict]:
+        """
+        Get availability summaries for several recruiters concurrently.
+
+        Returns:
+            One summary per recruiter, in the order of recruiter_emails
+        """
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self.get_available_slots_summary(
+                        recruiter_email=recruiter_email,
+                        start_date=start_date,
+                        end_date=end_date,
+                    )
+                    for recruiter_email in recruiter_emails
+                )
+            )
+        )
+
+
+def _seconds_of_day(value: time) -> int:
+    """Seconds elapsed since midnight at a given time of day."""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _seconds_since(midnight: datetime, value: datetime) -> int:
+    """Whole seconds elapsed between midnight and a datetime."""
+    return (value - midnight) // timedelta(seconds=1)
+
+
+async def _get_calendar_events_for_days(
+    user_email: str,
+    start_time: datetime,
+    end_time: datetime,
+) -> CalendarEventsResponse:
+    """
+    Fetch calendar events for the whole days covering a time range.
+
+    Widening the range to midnight makes repeated queries for the same days
+    hit the same get_calendar_events cache entry. The entry is keyed by the
+    exact span of days, so an overlapping but different span is fetched on
+    its own.
+    """
+    start_day = datetime.combine(start_time.date(), time(0, 0))
+    end_day = datetime.combine(end_time.date(), time(0, 0))
+    if end_day < end_time:
+        end_day += timedelta(days=1)
+
+    return await get_calendar_events(
+        user_email=user_email,
+        start_time=start_day,
+        end_time=end_day,
+    )
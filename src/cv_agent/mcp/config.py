@@ -1,13 +1,12 @@
-from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, HttpUrl
 
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
     url: HttpUrl = Field(
         alias="GOOGLE_WORKSPACE_MCP", description="Google Workspace MCP server URL"
     )
@@ -16,12 +15,11 @@ class Settings(BaseSettings):
         default="gemini-2.5-flash", alias="LLM_MODEL", description="LLM model to use"
     )
 
-    llm_temperature: float = Field(
-        default=1.0,
-        alias="LLM_TEMPERATURE",
-        description="LLM temperature setting",
-        ge=0.0,
-        le=2.0,
+    read_timeout: float = Field(
+        default=60.0,
+        alias="MCP_READ_TIMEOUT",
+        description="Seconds to wait for an MCP response before giving up",
+        gt=0.0,
     )
 
 
@@ -1,14 +1,76 @@
-from datetime import datetime
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
-from langchain_google_genai import ChatGoogleGenerativeAI
+from datetime import datetime, timedelta
 from langchain_core.messages import HumanMessage
 
-from langchain_mcp_adapters.tools import load_mcp_tools
-from langchain.agents import create_agent
-
+from cv_agent.cache import TTLCache
 from cv_agent.mcp.schemas import CalendarEventsResponse, ScheduleInterviewResponse
+from cv_agent.mcp.agents import AgentContext, get_agent
 from cv_agent.mcp.config import google_workspace_mcp_settings
+from cv_agent.mcp.session import mcp_session_pool
+
+# Calendar events fetched recently, keyed by user and hour-aligned range.
+# Entries of everyone invited to an interview are dropped once it is scheduled.
+_events_cache: TTLCache[CalendarEventsResponse] = TTLCache(maxsize=1024, ttl=60)
+
+# System prompt templates, filled with the user's email and the current time
+GET_EVENTS_SYSTEM_PROMPT = """You are a helpful assistant to manage calendar events for {user_email}. 
+Today's date and time is {now}.
+
+When retrieving calendar events:
+1. Use the get_events tool with the user's email
+2. Extract all relevant event information
+3. Return a structured response with all events found"""
+
+SCHEDULE_EVENT_SYSTEM_PROMPT = """You are a helpful assistant to schedule calendar events for {user_email}. 
+Today's date and time is {now}.
+
+When creating interview events:
+1. Use the create_event tool with all provided details
+2. Ensure all attendees are included
+3. Add Google Meet if requested
+4. Return a structured response with the created event details"""
+
+
+def _prompt_now() -> str:
+    """
+    Current time for the system prompts, truncated to the minute so that
+    calls within the same minute send an identical, cacheable prompt prefix.
+    """
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def _before(earlier: datetime, later: datetime) -> bool:
+    """
+    Whether one datetime comes before another.
+
+    Aware datetimes are compared as instants, so events reported in the
+    calendar's own offset still match a range given in another one; the
+    offset is only dropped when one side has none.
+    """
+    if (earlier.tzinfo is None) != (later.tzinfo is None):
+        earlier, later = earlier.replace(tzinfo=None), later.replace(tzinfo=None)
+    return earlier < later
+
+
+def _events_in_range(
+    events_response: CalendarEventsResponse, start_time: datetime, end_time: datetime
+) -> CalendarEventsResponse:
+    """Keep the events that overlap [start_time, end_time)"""
+    events = []
+    for event in events_response.events:
+        try:
+            event_start = datetime.fromisoformat(event.start_time)
+            event_end = datetime.fromisoformat(event.end_time)
+        except ValueError:
+            # Keep events whose times cannot be placed rather than hide them
+            events.append(event)
+            continue
+
+        if _before(event_start, end_time) and _before(start_time, event_end):
+            events.append(event)
+
+    if len(events) == len(events_response.events):
+        return events_response
+    return CalendarEventsResponse(events=events)
 
 
 async def get_calendar_events(
@@ -19,6 +81,10 @@ async def get_calendar_events(
     """
     Fetch calendar events for a user within a specified time range.
 
+    Responses are reused for a minute per user and range; the range is
+    widened to whole hours for the lookup and the events are then narrowed
+    back to the requested range.
+
     Args:
         user_email: The user's Google email address
         start_time: Start of the time range
@@ -27,50 +93,49 @@ async def get_calendar_events(
     Returns:
         CalendarEventsResponse with the events data
     """
-    async with streamablehttp_client(str(google_workspace_mcp_settings.url)) as (
-        read,
-        write,
-        _,
-    ):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await load_mcp_tools(session)
-
-            llm = ChatGoogleGenerativeAI(
-                model=google_workspace_mcp_settings.llm_model,
-                temperature=google_workspace_mcp_settings.llm_temperature,
-            )
-
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-            end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
-
-            system_prompt = f"""You are a helpful assistant to manage calendar events for {user_email}. 
-Today's date and time is {now_str}.
-
-When retrieving calendar events:
-1. Use the get_events tool with the user's email
-2. Extract all relevant event information
-3. Return a structured response with all events found"""
-
-            agent = create_agent(
-                llm,
-                tools,
-                response_format=CalendarEventsResponse,
-                system_prompt=system_prompt,
-            )
-
-            user_message = f"""Get all calendar events for {user_email} between {start_str} and {end_str}.
+    requested_start, requested_end = start_time, end_time
+
+    # Widen the range to whole hours so that repeated queries share an entry
+    start_time = start_time.replace(minute=0, second=0, microsecond=0)
+    end_hour = end_time.replace(minute=0, second=0, microsecond=0)
+    end_time = end_hour if end_hour == end_time else end_hour + timedelta(hours=1)
+
+    cache_key = (user_email.lower(), start_time, end_time)
+    cached_response = _events_cache.get(cache_key)
+    if cached_response is not None:
+        return _events_in_range(cached_response, requested_start, requested_end)
+
+    async with mcp_session_pool.connect() as (_, tools):
+        now_str = _prompt_now()
+        start_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
+        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
+
+        system_prompt = GET_EVENTS_SYSTEM_PROMPT.format_map(
+            {"user_email": user_email, "now": now_str}
+        )
+
+        agent = get_agent(
+            tools,
+            model=google_workspace_mcp_settings.llm_model,
+            temperature=0,  # Greedy decoding for the structured response
+            response_format=CalendarEventsResponse,
+        )
+
+        user_message = f"""Get all calendar events for {user_email} between {start_str} and {end_str}.
             
 Return the results in the following structured format:
 - events: list of all events with their details (summary, start_time, end_time, location, attendees, event_id, link)
 """
 
-            result = await agent.ainvoke(
-                {"messages": [HumanMessage(content=user_message)]}
-            )
+        result = await agent.ainvoke(
+            {"messages": [HumanMessage(content=user_message)]},
+            context=AgentContext(system_prompt=system_prompt),
+        )
+
+    events_response = result["structured_response"]
+    _events_cache.set(cache_key, events_response)
 
-            return result["structured_response"]
+    return _events_in_range(events_response, requested_start, requested_end)
 
 
 async def schedule_interview(
@@ -105,64 +170,48 @@ async def schedule_interview(
     Returns:
         ScheduleInterviewResponse with the created event details
     """
-    async with streamablehttp_client(str(google_workspace_mcp_settings.url)) as (
-        read,
-        write,
-        _,
-    ):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await load_mcp_tools(session)
-
-            llm = ChatGoogleGenerativeAI(
-                model=google_workspace_mcp_settings.llm_model,
-                temperature=google_workspace_mcp_settings.llm_temperature,
-            )
-
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            start_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
-            end_str = end_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            attendees = [candidate_email]
-            if interviewer_emails:
-                attendees.extend(interviewer_emails)
-
-            interview_description = (
-                f"Interview for position: {position}\nCandidate: {candidate_name}"
-            )
-            if description:
-                interview_description += f"\n\n{description}"
-
-            system_prompt = f"""You are a helpful assistant to schedule calendar events for {user_email}. 
-Today's date and time is {now_str}.
-
-When creating interview events:
-1. Use the create_event tool with all provided details
-2. Ensure all attendees are included
-3. Add Google Meet if requested
-4. Return a structured response with the created event details"""
-
-            agent = create_agent(
-                llm,
-                tools,
-                response_format=ScheduleInterviewResponse,
-                system_prompt=system_prompt,
-            )
-
-            user_message = f"""Schedule an interview event with the following details:
-- Summary: Interview - {candidate_name} for {position}
-- Start time: {start_str}
-- End time: {end_str}
-- Timezone: {timezone}
-- Description: {interview_description}
-- Attendees: {", ".join(attendees)}
-- Add Google Meet: {add_google_meet}
-"""
-
-            if location:
-                user_message += f"- Location: {location}\n"
-
-            user_message += """
+    async with mcp_session_pool.connect() as (_, tools):
+        now_str = _prompt_now()
+        start_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
+        end_str = end_time.strftime("%Y-%m-%dT%H:%M:%S")
+
+        attendees = [candidate_email]
+        if interviewer_emails:
+            attendees.extend(interviewer_emails)
+
+        description_parts = [
+            f"Interview for position: {position}",
+            f"Candidate: {candidate_name}",
+        ]
+        if description:
+            description_parts.extend(["", description])
+        interview_description = "\n".join(description_parts)
+
+        system_prompt = SCHEDULE_EVENT_SYSTEM_PROMPT.format_map(
+            {"user_email": user_email, "now": now_str}
+        )
+
+        agent = get_agent(
+            tools,
+            model=google_workspace_mcp_settings.llm_model,
+            temperature=0,  # Greedy decoding for the structured response
+            response_format=ScheduleInterviewResponse,
+        )
+
+        message_lines = [
+            "Schedule an interview event with the following details:",
+            f"- Summary: Interview - {candidate_name} for {position}",
+            f"- Start time: {start_str}",
+            f"- End time: {end_str}",
+            f"- Timezone: {timezone}",
+            f"- Description: {interview_description}",
+            f"- Attendees: {', '.join(attendees)}",
+            f"- Add Google Meet: {add_google_meet}",
+        ]
+        if location:
+            message_lines.append(f"- Location: {location}")
+
+        message_lines.append("""
 Return the results in the following structured format:
 - event_id: the created event ID
 - event_link: link to the calendar event
@@ -173,10 +222,19 @@ Return the results in the following structured format:
 - google_meet_link: Google Meet link (if added)
 - success: whether the event was created successfully
 - message: any relevant message or error
-"""
+""")
+        user_message = "\n".join(message_lines)
+
+        result = await agent.ainvoke(
+            {"messages": [HumanMessage(content=user_message)]},
+            context=AgentContext(system_prompt=system_prompt),
+        )
+
+    schedule_response = result["structured_response"]
 
-            result = await agent.ainvoke(
-                {"messages": [HumanMessage(content=user_message)]}
-            )
+    # The new event changes the calendars of everyone invited
+    if schedule_response.success:
+        invited = {email.lower() for email in [user_email, *attendees]}
+        _events_cache.evict(lambda key: key[0] in invited)
 
-            return result["structured_response"]
+    return schedule_response
@@ -1,20 +1,175 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Literal, Optional
-from dotenv import load_dotenv
-from pydantic import BaseModel, EmailStr, Field
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
 from langchain_core.messages import HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.tools import BaseTool
 from mcp import ClientSession
-from langchain.agents import create_agent
-from langchain_mcp_adapters.tools import load_mcp_tools
-from mcp.client.streamable_http import streamablehttp_client
 from cv_agent.mcp.availability_checker import AvailabilityConstraints
+from cv_agent.mcp.agents import AgentContext, get_agent
 from cv_agent.mcp.config import google_workspace_mcp_settings
+from cv_agent.mcp.schemas import EmailAddress
+from cv_agent.mcp.session import call_tool_text, mcp_session_pool
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Fields of the Gmail MCP tools' text output used to reply within a thread
+THREAD_ID_PATTERN = re.compile(r"Thread ID:\s*(\S+)")
+MESSAGE_ID_PATTERN = re.compile(r"Message ID:\s*(\S+)")
+MESSAGE_ID_HEADER_PATTERN = re.compile(r"^Message-ID:\s*(<[^>]+>)", re.I | re.M)
+REFERENCES_HEADER_PATTERN = re.compile(r"^References:\s*(.+)$", re.I | re.M)
+
+
+# Static system prompts. They hold no per-call values so the prefix of every
+# request is byte-identical and Gemini can serve it from its implicit cache;
+# recruiter, candidate and constraints go in the user message instead.
+SCHEDULING_SYSTEM_PROMPT = """You are an intelligent interview scheduling agent working for a recruiter.
+
+MISSION:
+Analyze the email conversation between the recruiter and candidate, check the recruiter's calendar availability,
+and determine the next step in scheduling an interview.
+
+The recruiter, candidate, job position and the recruiter's availability constraints are given in the request.
+
+AVAILABLE TOOLS:
+You have access to Google Workspace tools via MCP:
+- Gmail: Read emails, search threads, get message details
+- Google Calendar: Check availability, get free/busy times, list events
+
+WORKFLOW YOU MUST FOLLOW:
+
+1. READ EMAIL THREAD
+- Use Gmail tools to find all emails between the recruiter and the candidate
+- Search for emails related to interview scheduling for the job position
+- Read the complete conversation thread in chronological order
+
+2. ANALYZE CONVERSATION STATE
+- Determine if this is first contact (no emails yet)
+- Check if candidate has responded
+- Identify if candidate confirmed a specific date/time
+- Check if candidate asked questions or proposed alternatives
+- Look for explicit confirmation phrases like "Yes, I confirm" or "I'll be there on [date/time]"
+
+3. CHECK RECRUITER AVAILABILITY (if needed for next email)
+- Use Calendar tools to check the recruiter's calendar
+- Find available slots in the next 7-14 days
+- Respect all availability constraints (working hours, lunch break, etc.)
+- Find 3-5 suitable time slots that comply with constraints
+- Ensure slots don't conflict with existing meetings
+
+4. MAKE DECISION
+Status should be "DONE" ONLY when:
+- Candidate has EXPLICITLY confirmed a specific date and time
+- Both parties agreed on the schedule
+- Confirmation is unambiguous (e.g., "Yes, Monday December 2nd at 2 PM works for me")
+
+Status should be "IN_PROGRESS" when:
+- No email thread exists yet (initial outreach needed)
+- Candidate hasn't responded yet
+- Candidate responded but didn't confirm a time
+- Candidate asked questions without committing to a time
+- Candidate proposed alternatives that need confirmation
+- Candidate declined all times and needs new options
+- Any further communication is needed
+
+5. GENERATE OUTPUT
+If DONE:
+- Extract the confirmed interview datetime
+- Return it in ISO format
+- Include reasoning about what confirmed the meeting
+
+If IN_PROGRESS:
+- Compose a professional email
+- Include specific available time slots from calendar check
+- Address any questions or concerns from candidate
+- Keep it concise and action-oriented
+- Use proper email etiquette
+
+CRITICAL RULES:
+- ALWAYS use tools to read actual emails - do NOT assume or hallucinate email content
+- Example of valid search query "(from:recruiter@gmail.com to:candidate@gmail.com) OR (from:candidate@gmail.com to:recruiter@gmail.com)"
+- ALWAYS check calendar for actual availability - do NOT propose fake time slots
+- Only mark as DONE with explicit candidate confirmation
+- When proposing times, include date, day of week, time, and timezone
+- Be professional, warm, and concise in email generation
+- If tools fail, explain what failed in the reasoning
+
+EXAMPLE TIME SLOT FORMAT:
+"Here are some available times for our interview:
+- Monday, December 2, 2025 at 2:00 PM EST
+- Tuesday, December 3, 2025 at 10:30 AM EST
+- Wednesday, December 4, 2025 at 3:00 PM EST"
+
+Now, execute the workflow and provide your structured output."""
+
+SEND_EMAIL_SYSTEM_PROMPT = """You are an email sending assistant.
+
+MISSION:
+Send an email using Gmail on behalf of the recruiter. If an existing email thread exists between the sender and recipient, reply within that thread. Otherwise, send a new email.
+
+The sender, recipient, subject, body format, CC, BCC and body are given in the request.
+
+WORKFLOW YOU MUST FOLLOW:
+
+1. CHECK FOR EXISTING THREAD
+- Use search_gmail_messages to find any existing email conversation between the sender and the recipient
+- Search query example: "from:<recipient> OR to:<recipient>"
+- If messages are found, get the thread_id from the most recent message
+- Use get_gmail_thread_content to retrieve the full thread details if needed
+- Extract thread_id, in_reply_to (Message-ID), and references headers from the most recent message
+
+2. SEND EMAIL
+- If an existing thread was found:
+  - Use send_gmail_message with thread_id, in_reply_to, and references parameters to reply in the thread
+  - This keeps the conversation organized in Gmail
+- If no existing thread found:
+  - Use send_gmail_message to send a new email without thread parameters
+
+Parameters to use:
+- user_google_email: the sender email
+- to: the recipient email
+- subject: the subject
+- body: (the body content provided)
+- body_format: the body format
+- cc: the CC address, if any
+- bcc: the BCC address, if any
+- thread_id: (if replying to existing thread)
+- in_reply_to: (Message-ID from previous email if replying)
+- references: (chain of Message-IDs if replying)
+
+3. CONFIRM SUCCESS
+- After sending, confirm whether it was sent as a reply or new email
+- Return the message ID and thread information
+
+CRITICAL RULES:
+- ALWAYS search for existing threads first
+- If a thread exists, ALWAYS reply within it using thread_id, in_reply_to, and references
+- Use the exact parameters provided
+- Do NOT modify the subject or body content
+- Report any errors clearly
+- If search returns multiple threads, use the most recent one
+
+Now, execute the email sending workflow."""
+
+# Per-call request for the scheduling agent, filled with str.format_map
+SCHEDULING_USER_PROMPT = """Execute the interview scheduling workflow for:
+    - Recruiter: {recruiter_email}
+    - Candidate: {candidate_email} ({candidate_name})
+    - Position: {job_title}
+
+    {constraints_text}
+
+    Follow the workflow step by step:
+    1. Read the email thread between recruiter and candidate
+    2. Analyze the conversation state
+    3. Check recruiter's calendar availability if needed
+    4. Decide: DONE or IN_PROGRESS
+    5. Generate the appropriate output
+
+    Use the available tools to gather all necessary information before making your decision."""
 
 
 class EmailResponse(BaseModel):
@@ -22,8 +177,8 @@ class EmailResponse(BaseModel):
         ..., description="Status of the email operation"
     )
     message: str = Field(..., description="Human-readable message about the operation")
-    from_email: EmailStr = Field(..., description="Sender email address")
-    to: EmailStr = Field(..., description="Recipient email address")
+    from_email: EmailAddress = Field(..., description="Sender email address")
+    to: EmailAddress = Field(..., description="Recipient email address")
     subject: str = Field(..., description="Email subject line")
 
 
@@ -54,8 +209,23 @@ class InterviewSchedulingResult(BaseModel):
     )
 
 
+class InterviewSchedulingInput(BaseModel):
+    """Participants and position of one interview scheduling run"""
+
+    recruiter_email: EmailAddress = Field(description="Recruiter's email address")
+    candidate_email: EmailAddress = Field(description="Candidate's email address")
+    candidate_name: str = Field(description="Candidate's full name")
+    job_title: str = Field(description="Job position title")
+
+
+@lru_cache(maxsize=64)
 def format_constraints_for_prompt(constraints: AvailabilityConstraints) -> str:
-    """Format availability constraints for the system prompt"""
+    """
+    Format availability constraints for the scheduling prompt.
+
+    Constraints are frozen and rarely change between calls, so the formatted
+    text is memoized per distinct set of values.
+    """
     return f"""
 RECRUITER AVAILABILITY CONSTRAINTS:
 - Working Hours: {constraints.earliest_meeting_time.strftime("%I:%M %p")} - {constraints.latest_meeting_end.strftime("%I:%M %p")}
@@ -67,6 +237,56 @@ RECRUITER AVAILABILITY CONSTRAINTS:
 """
 
 
+async def _prefetch_scheduling_context(
+    session: ClientSession,
+    tools: List[BaseTool],
+    recruiter_email: str,
+    candidate_email: str,
+) -> str:
+    """
+    Search the recruiter/candidate email thread and list the recruiter's
+    upcoming events concurrently with direct MCP tool calls.
+
+    Returns:
+        Prompt section with the results, empty if none could be fetched
+    """
+    tool_names = {tool.name for tool in tools}
+    now = datetime.now(timezone.utc)
+
+    calls = {}
+    if "search_gmail_messages" in tool_names:
+        calls["EMAIL THREAD SEARCH RESULTS"] = call_tool_text(
+            session,
+            "search_gmail_messages",
+            {
+                "query": f"(from:{recruiter_email} to:{candidate_email}) OR "
+                f"(from:{candidate_email} to:{recruiter_email})",
+                "user_google_email": recruiter_email,
+            },
+        )
+    if "get_events" in tool_names:
+        calls["RECRUITER CALENDAR EVENTS (next 14 days)"] = call_tool_text(
+            session,
+            "get_events",
+            {
+                "user_google_email": recruiter_email,
+                "time_min": now.isoformat(timespec="seconds"),
+                "time_max": (now + timedelta(days=14)).isoformat(timespec="seconds"),
+            },
+        )
+
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+
+    sections = []
+    for title, result in zip(calls, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not prefetch %s: %s", title.lower(), result)
+            continue
+        sections.append(f"{title}:\n{result}")
+
+    return "\n\n".join(sections)
+
+
 async def schedule_interview_agent(
     recruiter_email: str,
     candidate_email: str,
@@ -94,180 +314,106 @@ async def schedule_interview_agent(
     if constraints is None:
         constraints = AvailabilityConstraints()
 
-    logger.info(f"Starting interview scheduling agent for {candidate_email}")
-
-    async with streamablehttp_client(str(google_workspace_mcp_settings.url)) as (
-        read,
-        write,
-        _,
-    ):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await load_mcp_tools(session)
-
-            llm = ChatGoogleGenerativeAI(
-                model=google_workspace_mcp_settings.llm_model,
-                temperature=google_workspace_mcp_settings.llm_temperature,
-            )
+    logger.info("Starting interview scheduling agent for %s", candidate_email)
 
+    try:
+        async with mcp_session_pool.connect() as (session, tools):
             constraints_text = format_constraints_for_prompt(constraints)
 
-            system_prompt = f"""You are an intelligent interview scheduling agent working for a recruiter.
-
-    MISSION:
-    Analyze the email conversation between the recruiter and candidate, check the recruiter's calendar availability, 
-    and determine the next step in scheduling an interview.
-
-    RECRUITER INFORMATION:
-    - Recruiter Email: {recruiter_email}
-    - Candidate Email: {candidate_email}
-    - Candidate Name: {candidate_name}
-    - Job Position: {job_title}
-
-    {constraints_text}
+            # Steps 1 and 3 of the workflow are independent reads; run them up
+            # front and concurrently instead of letting the agent plan them
+            prefetched_context = await _prefetch_scheduling_context(
+                session, tools, recruiter_email, candidate_email
+            )
 
-    AVAILABLE TOOLS:
-    You have access to Google Workspace tools via MCP:
-    - Gmail: Read emails, search threads, get message details
-    - Google Calendar: Check availability, get free/busy times, list events
-
-    WORKFLOW YOU MUST FOLLOW:
-
-    1. READ EMAIL THREAD
-    - Use Gmail tools to find all emails between {recruiter_email} and {candidate_email}
-    - Search for emails related to interview scheduling for {job_title}
-    - Read the complete conversation thread in chronological order
-
-    2. ANALYZE CONVERSATION STATE
-    - Determine if this is first contact (no emails yet)
-    - Check if candidate has responded
-    - Identify if candidate confirmed a specific date/time
-    - Check if candidate asked questions or proposed alternatives
-    - Look for explicit confirmation phrases like "Yes, I confirm" or "I'll be there on [date/time]"
-
-    3. CHECK RECRUITER AVAILABILITY (if needed for next email)
-    - Use Calendar tools to check {recruiter_email}'s calendar
-    - Find available slots in the next 7-14 days
-    - Respect all availability constraints (working hours, lunch break, etc.)
-    - Find 3-5 suitable time slots that comply with constraints
-    - Ensure slots don't conflict with existing meetings
-
-    4. MAKE DECISION
-    Status should be "DONE" ONLY when:
-    - Candidate has EXPLICITLY confirmed a specific date and time
-    - Both parties agreed on the schedule
-    - Confirmation is unambiguous (e.g., "Yes, Monday December 2nd at 2 PM works for me")
-    
-    Status should be "IN_PROGRESS" when:
-    - No email thread exists yet (initial outreach needed)
-    - Candidate hasn't responded yet
-    - Candidate responded but didn't confirm a time
-    - Candidate asked questions without committing to a time
-    - Candidate proposed alternatives that need confirmation
-    - Candidate declined all times and needs new options
-    - Any further communication is needed
-
-    5. GENERATE OUTPUT
-    If DONE:
-    - Extract the confirmed interview datetime
-    - Return it in ISO format
-    - Include reasoning about what confirmed the meeting
-    
-    If IN_PROGRESS:
-    - Compose a professional email
-    - Include specific available time slots from calendar check
-    - Address any questions or concerns from candidate
-    - Keep it concise and action-oriented
-    - Use proper email etiquette
-
-    CRITICAL RULES:
-    - ALWAYS use tools to read actual emails - do NOT assume or hallucinate email content
-    - Example of valid search query "(from:recruiter@gmail.com to:candidate@gmail.com) OR (from:candidate@gmail.com to:recruiter@gmail.com)"
-    - ALWAYS check calendar for actual availability - do NOT propose fake time slots
-    - Only mark as DONE with explicit candidate confirmation
-    - When proposing times, include date, day of week, time, and timezone
-    - Be professional, warm, and concise in email generation
-    - If tools fail, explain what failed in the reasoning
-
-    EXAMPLE TIME SLOT FORMAT:
-    "Here are some available times for our interview:
-    - Monday, December 2, 2025 at 2:00 PM EST
-    - Tuesday, December 3, 2025 at 10:30 AM EST  
-    - Wednesday, December 4, 2025 at 3:00 PM EST"
-
-    Now, execute the workflow and provide your structured output."""
-
-            agent = create_agent(
-                llm,
+            agent = get_agent(
                 tools,
+                model=google_workspace_mcp_settings.llm_model,
+                temperature=0,  # Greedy decoding for the structured response
                 response_format=InterviewSchedulingResult,
-                system_prompt=system_prompt,
             )
 
-            user_prompt = f"""Execute the interview scheduling workflow for:
-    - Recruiter: {recruiter_email}
-    - Candidate: {candidate_email} ({candidate_name})
-    - Position: {job_title}
-
-    Follow the workflow step by step:
-    1. Read the email thread between recruiter and candidate
-    2. Analyze the conversation state
-    3. Check recruiter's calendar availability if needed
-    4. Decide: DONE or IN_PROGRESS
-    5. Generate the appropriate output
-
-    Use the available tools to gather all necessary information before making your decision."""
-
-            try:
-                response = await agent.ainvoke(
+            prompt_parts = [
+                SCHEDULING_USER_PROMPT.format_map(
                     {
-                        "messages": [
-                            HumanMessage(content=user_prompt),
-                        ]
+                        "recruiter_email": recruiter_email,
+                        "candidate_email": candidate_email,
+                        "candidate_name": candidate_name,
+                        "job_title": job_title,
+                        "constraints_text": constraints_text,
                     }
                 )
+            ]
+            if prefetched_context:
+                prompt_parts.append(f"""
+    PREFETCHED CONTEXT (already retrieved for you; use tools only for details not covered here):
+
+{prefetched_context}""")
+            user_prompt = "\n".join(prompt_parts)
+
+            response = await agent.ainvoke(
+                {
+                    "messages": [
+                        HumanMessage(content=user_prompt),
+                    ]
+                },
+                context=AgentContext(system_prompt=SCHEDULING_SYSTEM_PROMPT),
+            )
+
+            result = response["structured_response"]
 
-                result = response["structured_response"]
-
-                # Validation
-                if result.interview_preparation_status == "DONE":
-                    if not result.schedule_start_time:
-                        logger.error(
-                            "Status is DONE but no schedule_start_time provided"
-                        )
-                        raise ValueError("DONE status requires schedule_start_time")
-                    if result.next_email:
-                        logger.warning(
-                            "Status is DONE but next_email provided, removing it"
-                        )
-                        result.next_email = None
-                    logger.info(
-                        f"Interview scheduled for: {result.schedule_start_time}"
+            # Validation
+            if result.interview_preparation_status == "DONE":
+                if not result.schedule_start_time:
+                    logger.error(
+                        "Status is DONE but no schedule_start_time provided"
                     )
+                    raise ValueError("DONE status requires schedule_start_time")
+                if result.next_email:
+                    logger.warning(
+                        "Status is DONE but next_email provided, removing it"
+                    )
+                    result.next_email = None
+                logger.info(
+                    "Interview scheduled for: %s", result.schedule_start_time
+                )
 
-                elif result.interview_preparation_status == "IN_PROGRESS":
-                    if not result.next_email:
-                        logger.error("Status is IN_PROGRESS but no next_email provided")
-                        raise ValueError("IN_PROGRESS status requires next_email")
-                    if result.schedule_start_time:
-                        logger.warning(
-                            "Status is IN_PROGRESS but schedule_start_time provided, removing it"
-                        )
-                        result.schedule_start_time = None
-                    logger.info(f"Next email prepared: {result.next_email.subject}")
-
-                logger.info(f"Agent completed: {result.interview_preparation_status}")
-                return result
-
-            except Exception as e:
-                logger.error(f"Error in scheduling agent: {e}", exc_info=True)
-
-                # Fallback: return a safe default
-                return InterviewSchedulingResult(
-                    interview_preparation_status="IN_PROGRESS",
-                    next_email=NextEmail(
-                        subject=f"Interview Opportunity - {job_title}",
-                        body=f"""Dear {candidate_name},
+            elif result.interview_preparation_status == "IN_PROGRESS":
+                if not result.next_email:
+                    logger.error("Status is IN_PROGRESS but no next_email provided")
+                    raise ValueError("IN_PROGRESS status requires next_email")
+                if result.schedule_start_time:
+                    logger.warning(
+                        "Status is IN_PROGRESS but schedule_start_time provided, removing it"
+                    )
+                    result.schedule_start_time = None
+                logger.info("Next email prepared: %s", result.next_email.subject)
+
+            logger.info("Agent completed: %s", result.interview_preparation_status)
+            return result
+
+    except Exception as e:
+        logger.error("Error in scheduling agent: %s", e, exc_info=True)
+
+        # Fallback: return a safe default
+        return _fallback_scheduling_result(
+            recruiter_email, candidate_name, job_title, constraints, e
+        )
+
+
+def _fallback_scheduling_result(
+    recruiter_email: str,
+    candidate_name: str,
+    job_title: str,
+    constraints: AvailabilityConstraints,
+    error: BaseException,
+) -> InterviewSchedulingResult:
+    """Initial outreach email used when the scheduling agent fails"""
+    return InterviewSchedulingResult(
+        interview_preparation_status="IN_PROGRESS",
+        next_email=NextEmail(
+            subject=f"Interview Opportunity - {job_title}",
+            body=f"""Dear {candidate_name},
 
     Thank you for your interest in the {job_title} position. We would like to schedule an interview with you.
 
@@ -275,9 +421,66 @@ async def schedule_interview_agent(
 
     Best regards,
     {recruiter_email.split("@")[0].title()}""",
-                    ),
-                    reasoning=f"Agent error occurred: {str(e)}. Defaulting to initial outreach email.",
-                )
+        ),
+        reasoning=f"Agent error occurred: {str(error)}. Defaulting to initial outreach email.",
+    )
+
+
+async def schedule_interview_agent_batch(
+    candidates: List[InterviewSchedulingInput],
+    constraints: Optional[AvailabilityConstraints] = None,
+    concurrency: int = 5,
+) -> List[InterviewSchedulingResult]:
+    """
+    Run the interview scheduling agent for several candidates concurrently.
+
+    All runs share the MCP session and the compiled agent. A candidate whose
+    run fails gets the initial outreach fallback without failing the batch.
+
+    Args:
+        candidates: Recruiter, candidate and position of each scheduling run
+        constraints: Optional availability constraints shared by all runs
+        concurrency: Maximum number of agent runs in flight at once
+
+    Returns:
+        One InterviewSchedulingResult per candidate, in input order
+    """
+    if constraints is None:
+        constraints = AvailabilityConstraints()
+
+    logger.info(
+        "Starting interview scheduling agent for %d candidates", len(candidates)
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def schedule_one(candidate: InterviewSchedulingInput):
+        async with semaphore:
+            return await schedule_interview_agent(
+                recruiter_email=candidate.recruiter_email,
+                candidate_email=candidate.candidate_email,
+                candidate_name=candidate.candidate_name,
+                job_title=candidate.job_title,
+                constraints=constraints,
+            )
+
+    results = await asyncio.gather(
+        *(schedule_one(candidate) for candidate in candidates),
+        return_exceptions=True,
+    )
+
+    return [
+        result
+        if isinstance(result, InterviewSchedulingResult)
+        else _fallback_scheduling_result(
+            candidate.recruiter_email,
+            candidate.candidate_name,
+            candidate.job_title,
+            constraints,
+            result,
+        )
+        for candidate, result in zip(candidates, results)
+    ]
 
 
 async def mcp_send_email(
@@ -288,6 +491,7 @@ async def mcp_send_email(
     cc: Optional[str] = None,
     bcc: Optional[str] = None,
     body_format: Literal["plain", "html"] = "plain",
+    use_llm_planner: bool = False,
 ) -> EmailResponse:
     """
     Send an email using the recruiter's Gmail account via MCP.
@@ -301,86 +505,151 @@ async def mcp_send_email(
         cc: Optional CC email address
         bcc: Optional BCC email address
         body_format: Email body format ('plain' or 'html')
+        use_llm_planner: Let an LLM agent drive the Gmail tools instead of
+            calling them directly
 
     Returns:
         dict with status and message_id or error information
     """
-    logger.info(f"Sending email from {recruiter_email} to {to}")
-
-    async with streamablehttp_client(str(google_workspace_mcp_settings.url)) as (
-        read,
-        write,
-        _,
-    ):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await load_mcp_tools(session)
-
-            llm = ChatGoogleGenerativeAI(
-                model=google_workspace_mcp_settings.llm_model,
-                temperature=0,  # Use 0 for deterministic email sending
-            )
-
-            system_prompt = f"""You are an email sending assistant.
-
-MISSION:
-Send an email using Gmail on behalf of the recruiter. If an existing email thread exists between the sender and recipient, reply within that thread. Otherwise, send a new email.
-
-SENDER INFORMATION:
-- Sender Email: {recruiter_email}
-- Recipient Email: {to}
-- Subject: {subject}
-- Body Format: {body_format}
-
-WORKFLOW YOU MUST FOLLOW:
-
-1. CHECK FOR EXISTING THREAD
-- Use search_gmail_messages to find any existing email conversation between {recruiter_email} and {to}
-- Search query example: "from:{to} OR to:{to}"
-- If messages are found, get the thread_id from the most recent message
-- Use get_gmail_thread_content to retrieve the full thread details if needed
-- Extract thread_id, in_reply_to (Message-ID), and references headers from the most recent message
+    logger.info("Sending email from %s to %s", recruiter_email, to)
 
-2. SEND EMAIL
-- If an existing thread was found:
-  - Use send_gmail_message with thread_id, in_reply_to, and references parameters to reply in the thread
-  - This keeps the conversation organized in Gmail
-- If no existing thread found:
-  - Use send_gmail_message to send a new email without thread parameters
-
-Parameters to use:
-- user_google_email: {recruiter_email}
-- to: {to}
-- subject: {subject}
-- body: (the body content provided)
-- body_format: {body_format}
-- cc: {cc if cc else "None"}
-- bcc: {bcc if bcc else "None"}
-- thread_id: (if replying to existing thread)
-- in_reply_to: (Message-ID from previous email if replying)
-- references: (chain of Message-IDs if replying)
-
-3. CONFIRM SUCCESS
-- After sending, confirm whether it was sent as a reply or new email
-- Return the message ID and thread information
+    try:
+        async with mcp_session_pool.connect() as (session, tools):
+            if use_llm_planner:
+                await _send_email_with_agent(
+                    tools, recruiter_email, to, subject, body, cc, bcc, body_format
+                )
+            else:
+                await _send_email_direct(
+                    session, recruiter_email, to, subject, body, cc, bcc, body_format
+                )
 
-CRITICAL RULES:
-- ALWAYS search for existing threads first
-- If a thread exists, ALWAYS reply within it using thread_id, in_reply_to, and references
-- Use the exact parameters provided
-- Do NOT modify the subject or body content
-- Report any errors clearly
-- If search returns multiple threads, use the most recent one
+        logger.info("Email sent successfully")
+
+        return EmailResponse(
+            status="success",
+            message="Email sent successfully",
+            from_email=recruiter_email,
+            to=to,
+            subject=subject,
+        )
+
+    except Exception as e:
+        logger.error("Error sending email: %s", e, exc_info=True)
+        return EmailResponse(
+            status="error",
+            message=f"Failed to send email: {str(e)}",
+            from_email=recruiter_email,
+            to=to,
+            subject=subject,
+        )
+
+
+async def _send_email_direct(
+    session: ClientSession,
+    recruiter_email: str,
+    to: str,
+    subject: str,
+    body: str,
+    cc: Optional[str],
+    bcc: Optional[str],
+    body_format: Literal["plain", "html"],
+) -> None:
+    """Send an email with direct Gmail tool calls, replying in an existing thread"""
+    arguments = {
+        "user_google_email": recruiter_email,
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "body_format": body_format,
+    }
+    if cc:
+        arguments["cc"] = cc
+    if bcc:
+        arguments["bcc"] = bcc
+
+    reply_arguments = await _get_reply_arguments(session, recruiter_email, to)
+    if reply_arguments:
+        logger.info("Replying in thread %s", reply_arguments["thread_id"])
+    arguments.update(reply_arguments)
+
+    await call_tool_text(session, "send_gmail_message", arguments)
+
+
+async def _get_reply_arguments(
+    session: ClientSession, recruiter_email: str, to: str
+) -> Dict[str, str]:
+    """
+    Find the most recent message exchanged with a recipient.
 
-Now, execute the email sending workflow."""
+    Returns:
+        thread_id, and in_reply_to/references when the message headers can be
+        read; empty if there is no existing thread
+    """
+    search_results = await call_tool_text(
+        session,
+        "search_gmail_messages",
+        {"query": f"from:{to} OR to:{to}", "user_google_email": recruiter_email},
+    )
 
-            agent = create_agent(
-                llm,
-                tools,
-                system_prompt=system_prompt,
-            )
+    # Gmail lists the most recent message first
+    thread_match = THREAD_ID_PATTERN.search(search_results)
+    if thread_match is None:
+        return {}
+
+    reply_arguments = {"thread_id": thread_match.group(1)}
+
+    message_match = MESSAGE_ID_PATTERN.search(search_results)
+    if message_match is None:
+        return reply_arguments
+
+    # Without the headers the email still lands in the sender's thread
+    try:
+        message_content = await call_tool_text(
+            session,
+            "get_gmail_message_content",
+            {
+                "message_id": message_match.group(1),
+                "user_google_email": recruiter_email,
+            },
+        )
+    except Exception as e:
+        logger.warning("Could not read headers of the last message: %s", e)
+        return reply_arguments
+
+    header_match = MESSAGE_ID_HEADER_PATTERN.search(message_content)
+    if header_match is not None:
+        message_id = header_match.group(1)
+        references_match = REFERENCES_HEADER_PATTERN.search(message_content)
+
+        reply_arguments["in_reply_to"] = message_id
+        reply_arguments["references"] = (
+            f"{references_match.group(1).strip()} {message_id}"
+            if references_match
+            else message_id
+        )
+
+    return reply_arguments
+
+
+async def _send_email_with_agent(
+    tools: List[BaseTool],
+    recruiter_email: str,
+    to: str,
+    subject: str,
+    body: str,
+    cc: Optional[str],
+    bcc: Optional[str],
+    body_format: Literal["plain", "html"],
+) -> None:
+    """Send an email by letting an LLM agent drive the Gmail tools"""
+    agent = get_agent(
+        tools,
+        model=google_workspace_mcp_settings.llm_model,
+        temperature=0,  # Use 0 for deterministic email sending
+    )
 
-            user_prompt = f"""Send the following email, checking first if there's an existing thread to reply to:
+    user_prompt = f"""Send the following email, checking first if there's an existing thread to reply to:
 
 From: {recruiter_email}
 To: {to}
@@ -400,32 +669,11 @@ Step-by-step:
 
 Use the Gmail tools to complete this workflow."""
 
-            try:
-                response = await agent.ainvoke(
-                    {
-                        "messages": [
-                            HumanMessage(content=user_prompt),
-                        ]
-                    }
-                )
-
-                # Extract the result from the agent's response
-                logger.info("Email sent successfully")
-
-                return EmailResponse(
-                    status="success",
-                    message="Email sent successfully",
-                    from_email=recruiter_email,
-                    to=to,
-                    subject=subject,
-                )
-
-            except Exception as e:
-                logger.error(f"Error sending email: {e}", exc_info=True)
-                return EmailResponse(
-                    status="error",
-                    message=f"Failed to send email: {str(e)}",
-                    from_email=recruiter_email,
-                    to=to,
-                    subject=subject,
-                )
+    await agent.ainvoke(
+        {
+            "messages": [
+                HumanMessage(content=user_prompt),
+            ]
+        },
+        context=AgentContext(system_prompt=SEND_EMAIL_SYSTEM_PROMPT),
+    )
@@ -1,10 +1,21 @@
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Syntactic check only: one "@", no whitespace and a dot in the domain
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+# Email address type used by the MCP models and the API request schemas alike,
+# validated by pydantic-core with the pattern above instead of email-validator
+EmailAddress = Annotated[
+    str, StringConstraints(strip_whitespace=True, pattern=EMAIL_PATTERN)
+]
 
 
 class CalendarEvent(BaseModel):
     """Represents a single calendar event."""
 
+    model_config = ConfigDict(frozen=True)
+
     summary: str = Field(description="Event title/summary")
     start_time: str = Field(description="Event start time in ISO format")
     end_time: str = Field(description="Event end time in ISO format")
@@ -19,10 +30,14 @@ class CalendarEvent(BaseModel):
 class CalendarEventsResponse(BaseModel):
     """Response containing calendar events."""
 
+    model_config = ConfigDict(frozen=True)
+
     events: List[CalendarEvent] = Field(description="List of calendar events")
 
 
 class ScheduleInterviewResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     event_id: str
     event_link: str
     summary: str
@@ -0,0 +1,206 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import anyio
+import httpx
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from cv_agent.mcp.config import google_workspace_mcp_settings
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the MCP connection is gone and must be re-established
+CONNECTION_ERRORS = (
+    ConnectionError,
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+)
+
+# McpError codes meaning the session itself is gone: a closed transport, or a
+# session the server no longer knows (e.g. after a restart), which the MCP
+# client reports as "Session terminated" with code 32600. Other McpErrors,
+# such as read timeouts or JSON-RPC errors, only concern the failed call.
+SESSION_CLOSED_CODES = (CONNECTION_CLOSED, 32600)
+
+
+class _Connection:
+    """One MCP session, the task owning its transport and the tasks using it"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.ready: asyncio.Future = loop.create_future()
+        self.closing = asyncio.Event()
+        self.closed = False
+        self.borrowers: Set[asyncio.Task] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    def release_borrowers(self) -> None:
+        """Interrupt tasks still waiting on this session once it is gone"""
+        self.closed = True
+        for task in self.borrowers:
+            task.cancel()
+        self.borrowers.clear()
+
+
+class McpSessionPool:
+    """
+    Process-wide MCP client session shared by all Google Workspace calls.
+
+    The session is opened once, initialized and its tools loaded, then reused
+    until it is closed or its connection breaks. The MCP transport must be
+    entered and exited from the same task, so a background task owns it and
+    callers only borrow the session. Callers still waiting on a session when
+    it closes get a ConnectionError instead of waiting forever.
+    """
+
+    def __init__(self, url: str, read_timeout: timedelta):
+        self.url = url
+        self.read_timeout = read_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._connection: Optional[_Connection] = None
+
+    async def get(self) -> Tuple[ClientSession, List[BaseTool]]:
+        """Return the shared session and its tools, connecting on first use"""
+        connection = await self._get_connection()
+        return await asyncio.shield(connection.ready)
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[Tuple[ClientSession, List[BaseTool]]]:
+        """Borrow the shared session, dropping it if its connection breaks"""
+        connection = await self._get_connection()
+        session, tools = await asyncio.shield(connection.ready)
+
+        task = asyncio.current_task()
+        connection.borrowers.add(task)
+        try:
+            yield session, tools
+
+        except asyncio.CancelledError:
+            # Cancelled by the closing session rather than by our caller
+            if connection.closed and task.uncancel() == 0:
+                raise ConnectionError("MCP session closed during the call") from None
+            raise
+
+        except Exception as e:
+            if not _is_connection_lost(e):
+                raise
+
+            logger.warning(f"MCP connection lost ({e}), reconnecting on next use")
+            connection.borrowers.discard(task)
+            await self._close(connection)
+            raise
+
+        finally:
+            connection.borrowers.discard(task)
+
+    async def invalidate(self) -> None:
+        """Close the current session so the next caller opens a new one"""
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        if self._connection is not None:
+            await self._close(self._connection)
+
+    async def aclose(self) -> None:
+        """Close the session on application shutdown"""
+        await self.invalidate()
+
+    async def _get_connection(self) -> _Connection:
+        """Return the current connection, starting a new one if needed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new event loop (e.g. a fresh asyncio.run) cannot reuse a
+            # session bound to the previous one
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._connection = None
+
+        async with self._lock:
+            connection = self._connection
+            if connection is None or connection.task.done():
+                logger.info(f"Connecting to MCP server at {self.url}")
+                connection = _Connection(loop)
+                connection.task = asyncio.create_task(self._run(connection))
+                self._connection = connection
+
+        return connection
+
+    async def _close(self, connection: _Connection) -> None:
+        """Close a connection, forgetting it if it is still the current one"""
+        async with self._lock:
+            if self._connection is connection:
+                self._connection = None
+
+        connection.closing.set()
+        await asyncio.gather(connection.task, return_exceptions=True)
+
+    async def _run(self, connection: _Connection) -> None:
+        """Own the MCP transport for the lifetime of one session"""
+        ready = connection.ready
+        try:
+            async with streamablehttp_client(self.url) as (read, write, _):
+                async with ClientSession(
+                    read, write, read_timeout_seconds=self.read_timeout
+                ) as session:
+                    await session.initialize()
+                    tools = await load_mcp_tools(session)
+
+                    ready.set_result((session, tools))
+                    await connection.closing.wait()
+
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.warning(f"MCP session closed with error: {e}")
+
+            if isinstance(e, (asyncio.CancelledError, KeyboardInterrupt, SystemExit)):
+                raise
+
+        finally:
+            connection.release_borrowers()
+
+
+def _is_connection_lost(error: Exception) -> bool:
+    """Whether an error means the shared session cannot be used any more"""
+    if isinstance(error, McpError):
+        return error.error.code in SESSION_CLOSED_CODES
+    return isinstance(error, CONNECTION_ERRORS)
+
+
+async def call_tool_text(
+    session: ClientSession, name: str, arguments: Dict[str, Any]
+) -> str:
+    """
+    Call an MCP tool directly, without an LLM in the loop.
+
+    Returns:
+        The text content of the tool result
+
+    Raises:
+        RuntimeError: If the tool reports an error
+    """
+    result = await session.call_tool(name, arguments)
+    text = "\n".join(
+        content.text for content in result.content if content.type == "text"
+    )
+
+    if result.isError:
+        raise RuntimeError(f"MCP tool {name} failed: {text}")
+
+    return text
+
+
+mcp_session_pool = McpSessionPool(
+    str(google_workspace_mcp_settings.url),
+    read_timeout=timedelta(seconds=google_workspace_mcp_settings.read_timeout),
+)
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal, TypedDict
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, List, Literal, TypedDict
 
 
 class Contact(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: str = ""
     phone: str = ""
     linkedin: str = ""
@@ -10,6 +12,8 @@ class Contact(BaseModel):
 
 
 class Education(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     degree: str = ""
     field: str = ""
     institution: str = ""
@@ -18,6 +22,8 @@ class Education(BaseModel):
 
 
 class Experience(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     job_title: str = ""
     company: str = ""
     location: str = ""
@@ -27,11 +33,15 @@ class Experience(BaseModel):
 
 
 class Project(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str = ""
     description: str = ""
 
 
 class ParsedCV(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     full_name: str = ""
     contact: Contact = Field(default_factory=Contact)
     summary: str = ""
@@ -43,8 +53,14 @@ class ParsedCV(BaseModel):
     projects: List[Project] = Field(default_factory=list)
 
 
+# Candidate classification shared by the agent output and the API response
+Priority = Literal["recommended", "highly-recommended", "not-recommended"]
+
+
 class PriorityAnalysisResponse(BaseModel):
-    priority: Literal["recommended", "highly-recommended", "not-recommended"] = Field(
+    model_config = ConfigDict(frozen=True)
+
+    priority: Priority = Field(
         default="not-recommended", description="The priority level of the candidate"
     )
     priority_description: str = Field(
@@ -54,6 +70,8 @@ class PriorityAnalysisResponse(BaseModel):
 
 
 class EmailTemplate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     subject: str = Field(default="", description="Email subject line")
     body: str = Field(
         default="", description="Email body with FULL_NAME as placeholder"
@@ -64,6 +82,11 @@ class CvProcessingFinalResult(ParsedCV, PriorityAnalysisResponse):
     email_response_example: EmailTemplate
 
 
+def merge_errors(left: str, right: str) -> str:
+    """Join errors reported by workflow nodes running in the same step"""
+    return "; ".join(error for error in (left, right) if error)
+
+
 class CvAnalysisState(TypedDict):
     cv_text: str
     job_description: str
@@ -71,4 +94,4 @@ class CvAnalysisState(TypedDict):
     priority_analysis: PriorityAnalysisResponse
     email_template: EmailTemplate
     final_result: CvProcessingFinalResult
-    error: str
+    error: Annotated[str, merge_errors]
@@ -1,3 +1,3 @@
-from cv_agent.agent import CVAnalysisAgent
+from cv_agent.agent import get_cv_analysis_agent
 
-graph = CVAnalysisAgent().app
+graph = get_cv_analysis_agent().app
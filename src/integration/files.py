@@ -1,19 +1,53 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import HTTPException
 import httpx
 
 logger = logging.getLogger(__name__)
 
+_client: httpx.AsyncClient | None = None
 
-async def download(file_url: str) -> httpx.Response:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            file_response = await client.get(file_url)
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide HTTP client, creating it on first use.
+
+    Sharing one client keeps connections alive between downloads, so repeated
+    downloads from the same host skip the TCP and TLS handshakes.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client (called on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def stream(file_url: str) -> AsyncIterator[httpx.Response]:
+    """
+    Open a streaming download of a file.
+
+    The response headers are available as soon as the context is entered,
+    the body is read by the caller (e.g. with `aiter_bytes`).
+    """
+    try:
+        async with get_client().stream("GET", file_url) as file_response:
             file_response.raise_for_status()
-            return file_response
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to download file from URL: {str(e)}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to download file from URL: {str(e)}",
-            )
+            yield file_response
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to download file from URL: {str(e)}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to download file from URL: {str(e)}",
+        )
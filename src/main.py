@@ -1,26 +1,56 @@
+# Load .env before anything reads the environment (settings, Gemini clients)
+from dotenv import load_dotenv
+
+load_dotenv()
+
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from core.config import settings
 from api.main import api_router
+from integration import files
+from cv_agent.agent import shutdown_parser_pool
+from cv_agent.mcp.session import mcp_session_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared MCP session up front; the app still starts without it
+    # and the first MCP call retries the connection
+    try:
+        await mcp_session_pool.get()
+    except Exception as e:
+        logger.warning(f"Could not connect to MCP server on startup: {e}")
+
+    yield
+
+    await mcp_session_pool.aclose()
+    await files.aclose()
+    shutdown_parser_pool()
+
+
 app = FastAPI(
     title="CV Analysis API",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     description="API for analyzing CVs against job descriptions using LangGraph agent",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
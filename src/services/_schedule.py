@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+from services._types import EmailAddress, ShortStr
+
+
+class ScheduleInterviewBase(BaseModel):
+    """Candidate fields shared by the calendar and email scheduling requests."""
+
+    model_config = ConfigDict(frozen=True)
+
+    candidate_name: ShortStr = Field(..., description="Full name of the candidate")
+    candidate_email: EmailAddress = Field(
+        ..., description="Email address of the candidate"
+    )
@@ -0,0 +1,12 @@
+from typing import Annotated
+from pydantic import StringConstraints
+
+# Same email validation as the MCP models, so a request accepted here is never
+# rejected after the email has been sent
+from cv_agent.mcp.schemas import EmailAddress
+
+# Required text fields: whitespace-trimmed names, and job titles kept as sent
+ShortStr = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)
+]
+LongStr = Annotated[str, StringConstraints(min_length=1, max_length=200)]
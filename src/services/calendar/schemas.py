@@ -1,19 +1,58 @@
 from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field
+
+from services._schedule import ScheduleInterviewBase
+from services._types import EmailAddress
+
+# OpenAPI request examples
+_GET_CALENDAR_EVENTS_EXAMPLE = {
+    "example": {
+        "user_email": "user@example.com",
+        "start_time": "2025-12-01T00:00:00",
+        "end_time": "2025-12-31T23:59:59",
+    }
+}
+
+_SCHEDULE_INTERVIEW_EXAMPLE = {
+    "example": {
+        "user_email": "recruiter@company.com",
+        "candidate_name": "John Doe",
+        "candidate_email": "john.doe@example.com",
+        "position": "Senior Software Engineer",
+        "start_time": "2024-12-10T14:00:00",
+        "end_time": "2024-12-10T15:00:00",
+        "timezone": "America/New_York",
+        "location": "Office - Conference Room A",
+        "interviewer_emails": [
+            "interviewer1@company.com",
+            "interviewer2@company.com",
+        ],
+        "add_google_meet": True,
+        "description": "Technical interview focusing on system design and coding skills.",
+    }
+}
 
 
 class GetAvailableSlots(BaseModel):
-    user_email: EmailStr = Field(..., description="The user's Google email address")
+    model_config = ConfigDict(frozen=True)
+
+    user_email: EmailAddress = Field(..., description="The user's Google email address")
 
 
 class GetAvailableSlotResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     available_slots: str
 
 
 class GetCalendarEvents(BaseModel):
     """Request schema for getting calendar events via API."""
 
-    user_email: EmailStr = Field(..., description="The user's Google email address")
+    model_config = ConfigDict(
+        frozen=True, json_schema_extra=_GET_CALENDAR_EVENTS_EXAMPLE
+    )
+
+    user_email: EmailAddress = Field(..., description="The user's Google email address")
     start_time: datetime = Field(
         ..., description="Start of the time range for fetching events"
     )
@@ -21,55 +60,28 @@ class GetCalendarEvents(BaseModel):
         ..., description="End of the time range for fetching events"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_email": "user@example.com",
-                "start_time": "2025-12-01T00:00:00",
-                "end_time": "2025-12-31T23:59:59",
-            }
-        }
-
 
-class ScheduleInterviewRequest(BaseModel):
+class ScheduleInterviewRequest(ScheduleInterviewBase):
     """Request schema for scheduling an interview."""
 
-    user_email: EmailStr = Field(
-        ..., description="The organizer's Google email address"
+    model_config = ConfigDict(
+        frozen=True, json_schema_extra=_SCHEDULE_INTERVIEW_EXAMPLE
     )
-    candidate_name: str = Field(
-        ..., description="Name of the candidate being interviewed"
+
+    user_email: EmailAddress = Field(
+        ..., description="The organizer's Google email address"
     )
-    candidate_email: EmailStr = Field(..., description="Email of the candidate")
+    # Unconstrained here, unlike the email request's length-checked name
+    candidate_name: str = Field(..., description="Full name of the candidate")
     position: str = Field(..., description="Position/role for the interview")
     start_time: datetime = Field(..., description="Interview start time")
     end_time: datetime = Field(..., description="Interview end time")
     timezone: str = Field(default="UTC", description="Timezone for the event")
     location: str | None = Field(None, description="Physical location (optional)")
-    interviewer_emails: list[EmailStr] | None = Field(
+    interviewer_emails: list[EmailAddress] | None = Field(
         None, description="List of additional interviewer emails"
     )
     add_google_meet: bool = Field(True, description="Whether to add Google Meet link")
     description: str | None = Field(
         None, description="Additional description for the interview"
     )
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_email": "recruiter@company.com",
-                "candidate_name": "John Doe",
-                "candidate_email": "john.doe@example.com",
-                "position": "Senior Software Engineer",
-                "start_time": "2024-12-10T14:00:00",
-                "end_time": "2024-12-10T15:00:00",
-                "timezone": "America/New_York",
-                "location": "Office - Conference Room A",
-                "interviewer_emails": [
-                    "interviewer1@company.com",
-                    "interviewer2@company.com",
-                ],
-                "add_google_meet": True,
-                "description": "Technical interview focusing on system design and coding skills.",
-            }
-        }
@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+
+from cv_agent.models import Priority
 
 
 class Contact(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: str = ""
     phone: str = ""
     linkedin: str = ""
@@ -10,6 +14,8 @@ class Contact(BaseModel):
 
 
 class Education(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     degree: str = ""
     field: str = ""
     institution: str = ""
@@ -18,6 +24,8 @@ class Education(BaseModel):
 
 
 class Experience(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     job_title: str = ""
     company: str = ""
     location: str = ""
@@ -27,21 +35,36 @@ class Experience(BaseModel):
 
 
 class Project(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str = ""
     description: str = ""
 
 
 class CVAnalysisRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     fileUrl: str
     jobDescription: str
 
 
+class CVBatchAnalysisRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    fileUrls: List[str] = Field(..., min_length=1, max_length=100)
+    jobDescription: str
+
+
 class EmailResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     subject: str
     body: str
 
 
 class CVAnalysisResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     full_name: str = ""
     contact: Contact = Field(default_factory=Contact)
     summary: str = ""
@@ -51,6 +74,20 @@ class CVAnalysisResponse(BaseModel):
     experience: List[Experience] = Field(default_factory=list)
     certifications: List[str] = Field(default_factory=list)
     projects: List[Project] = Field(default_factory=list)
-    priority: Literal["recommended", "highly-recommended", "not-recommended"]
+    priority: Priority
     priority_description: str
     email_response_example: EmailResponse
+
+
+class CVBatchAnalysisItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    fileUrl: str
+    result: Optional[CVAnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class CVBatchAnalysisResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    results: List[CVBatchAnalysisItem]
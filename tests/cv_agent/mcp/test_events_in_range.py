@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+import os
+
+os.environ.setdefault("GOOGLE_WORKSPACE_MCP", "http://localhost:8000/mcp")
+
+from cv_agent.mcp.g_calendar import _events_in_range
+from cv_agent.mcp.schemas import CalendarEvent, CalendarEventsResponse
+
+
+def make_events(*times: tuple[str, str]) -> CalendarEventsResponse:
+    return CalendarEventsResponse(
+        events=[
+            CalendarEvent(
+                summary=f"Event {i}", start_time=start, end_time=end, event_id=str(i)
+            )
+            for i, (start, end) in enumerate(times)
+        ]
+    )
+
+
+def summaries(events_response: CalendarEventsResponse) -> list[str]:
+    return [event.summary for event in events_response.events]
+
+
+def test_mixed_offsets_are_compared_as_instants():
+    events = make_events(
+        ("2026-10-15T11:00:00+02:00", "2026-10-15T11:30:00+02:00"),  # 09:00Z
+        ("2026-10-15T09:00:00+02:00", "2026-10-15T10:00:00+02:00"),  # ends 08:00Z
+        ("2026-10-15T12:00:00+02:00", "2026-10-15T13:00:00+02:00"),  # 10:00Z
+        ("2026-10-15T05:30:00-03:00", "2026-10-15T06:00:00-03:00"),  # 08:30Z
+    )
+
+    result = _events_in_range(
+        events,
+        datetime(2026, 10, 15, 8, tzinfo=timezone.utc),
+        datetime(2026, 10, 15, 10, tzinfo=timezone.utc),
+    )
+
+    assert summaries(result) == ["Event 0", "Event 3"]
+
+
+def test_naive_side_falls_back_to_wall_clock():
+    events = make_events(
+        ("2026-10-15T10:00:00+02:00", "2026-10-15T10:30:00+02:00"),
+        ("2026-10-15T11:00:00", "2026-10-15T12:00:00"),
+        ("2026-10-15", "2026-10-16"),  # All-day event
+    )
+
+    result = _events_in_range(
+        events,
+        datetime(2026, 10, 15, 8, tzinfo=timezone.utc),
+        datetime(2026, 10, 15, 10, tzinfo=timezone.utc),
+    )
+
+    assert summaries(result) == ["Event 0", "Event 2"]
+
+
+def test_unparseable_times_are_kept():
+    events = make_events(("tomorrow", "later"))
+
+    result = _events_in_range(
+        events, datetime(2026, 10, 15, 8), datetime(2026, 10, 15, 10)
+    )
+
+    assert summaries(result) == ["Event 0"]
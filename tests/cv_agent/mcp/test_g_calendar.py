@@ -1,15 +1,22 @@
 import asyncio
 from datetime import datetime, timedelta
+import sys
+import traceback
 
 from dotenv import load_dotenv
 
 from cv_agent.mcp.g_calendar import schedule_interview
 
-load_dotenv()
+
+# Candidates to schedule, one hour apart starting tomorrow at 2 PM
+CANDIDATES = [
+    {"candidate_name": "John Doe", "candidate_email": "candidate@gmail.com"},
+]
 
 
 async def main():
     """Test the schedule_interview method."""
+    load_dotenv()
 
     # Configure your test parameters
     user_email = "recruiter@gmail.com"  # Replace with your actual email
@@ -18,60 +25,71 @@ async def main():
     print("Testing Schedule Interview")
     print("=" * 80)
 
-    try:
-        # Schedule interview for tomorrow at 2 PM
-        interview_start = datetime.now() + timedelta(days=1)
-        interview_start = interview_start.replace(
-            hour=14, minute=0, second=0, microsecond=0
-        )
+    # Schedule interviews for tomorrow from 2 PM, one hour each
+    first_start = datetime.now() + timedelta(days=1)
+    first_start = first_start.replace(hour=14, minute=0, second=0, microsecond=0)
+
+    interviews = []
+    for i, candidate in enumerate(CANDIDATES):
+        interview_start = first_start + timedelta(hours=i)
         interview_end = interview_start + timedelta(hours=1)
+        interviews.append(
+            dict(
+                user_email=user_email,
+                position="Senior Software Engineer",
+                start_time=interview_start,
+                end_time=interview_end,
+                timezone="Europe/Kyiv",
+                interviewer_emails=None,
+                add_google_meet=True,
+                description="Technical interview focusing on system design and coding skills.",
+                **candidate,
+            )
+        )
 
-        print(f"\nScheduling interview...")
-        print(f"Organizer: {user_email}")
-        print(f"Candidate: John Doe (john.doe@example.com)")
-        print(f"Position: Senior Software Engineer")
-        print(
-            f"Date & Time: {interview_start.strftime('%Y-%m-%d %H:%M')} - {interview_end.strftime('%H:%M')}"
+    print(f"\nScheduling {len(interviews)} interview(s) concurrently...")
+    print(f"Organizer: {user_email}")
+    print("-" * 80)
+
+    # The calls are independent, so they run concurrently
+    results = await asyncio.gather(
+        *(schedule_interview(**interview) for interview in interviews),
+        return_exceptions=True,
+    )
+
+    lines = []
+    for interview, interview_response in zip(interviews, results):
+        lines.append(
+            f"\nCandidate: {interview['candidate_name']} ({interview['candidate_email']})"
         )
-        print(f"Duration: 1 hour")
-        print("-" * 80)
-
-        interview_response = await schedule_interview(
-            user_email=user_email,
-            candidate_name="John Doe",
-            candidate_email="candidate@gmail.com",
-            position="Senior Software Engineer",
-            start_time=interview_start,
-            end_time=interview_end,
-            timezone="Europe/Kyiv",
-            interviewer_emails=None,
-            add_google_meet=True,
-            description="Technical interview focusing on system design and coding skills.",
+        lines.append(
+            f"Date & Time: {interview['start_time'].strftime('%Y-%m-%d %H:%M')} - {interview['end_time'].strftime('%H:%M')}"
         )
 
-        if interview_response.success:
-            print(f"\n✅ Successfully scheduled interview!")
-            print(f"\nEvent Details:")
-            print(f"  Event ID: {interview_response.event_id}")
-            print(f"  Title: {interview_response.summary}")
-            print(f"  Start: {interview_response.start_time}")
-            print(f"  End: {interview_response.end_time}")
-            print(f"  Attendees: {', '.join(interview_response.attendees)}")
-            print(f"  Google Meet: {interview_response.google_meet_link or 'N/A'}")
-            print(f"  Calendar Link: {interview_response.event_link}")
+        if isinstance(interview_response, Exception):
+            lines.append(f"\n❌ Error scheduling interview: {interview_response}")
+            lines.extend(
+                line.rstrip("\n")
+                for line in traceback.format_exception(interview_response)
+            )
+        elif interview_response.success:
+            lines.append(f"\n✅ Successfully scheduled interview!")
+            lines.append(f"\nEvent Details:")
+            lines.append(f"  Event ID: {interview_response.event_id}")
+            lines.append(f"  Title: {interview_response.summary}")
+            lines.append(f"  Start: {interview_response.start_time}")
+            lines.append(f"  End: {interview_response.end_time}")
+            lines.append(f"  Attendees: {', '.join(interview_response.attendees)}")
+            lines.append(f"  Google Meet: {interview_response.google_meet_link or 'N/A'}")
+            lines.append(f"  Calendar Link: {interview_response.event_link}")
             if interview_response.message:
-                print(f"  Message: {interview_response.message}")
+                lines.append(f"  Message: {interview_response.message}")
         else:
-            print(f"\n❌ Failed to schedule interview")
-            print(f"  Message: {interview_response.message}")
-
-    except Exception as e:
-        print(f"\n❌ Error scheduling interview: {e}")
-        import traceback
-
-        traceback.print_exc()
+            lines.append(f"\n❌ Failed to schedule interview")
+            lines.append(f"  Message: {interview_response.message}")
 
-    print("\n" + "=" * 80)
+    lines.append("\n" + "=" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,52 +1,82 @@
 import asyncio
 from datetime import datetime, timedelta
 import os
+import sys
 
 from dotenv import load_dotenv
 
 from cv_agent.mcp.g_calendar import get_calendar_events
 
-load_dotenv()
+
+def format_events(user_email: str, events_response) -> list[str]:
+    lines = [f"Found {len(events_response.events)} events for {user_email}:\n"]
+
+    for i, event in enumerate(events_response.events, 1):
+        lines.append(f"{i}. {event.summary}")
+        lines.append(f"   Time: {event.start_time} to {event.end_time}")
+        if event.location:
+            lines.append(f"   Location: {event.location}")
+        if event.attendees:
+            lines.append(f"   Attendees: {', '.join(event.attendees)}")
+        if event.link:
+            lines.append(f"   Link: {event.link}")
+        lines.append("")
+
+    return lines
 
 
 async def main():
     """Example usage of the calendar events fetcher."""
-    # Example: Get events for today
-    user_email = os.getenv("USER_EMAIL", "")
+    load_dotenv()
+
+    # Example: Get events for the next week, for one or more
+    # comma-separated users
+    user_emails = [
+        email.strip()
+        for email in os.getenv("USER_EMAIL", "").split(",")
+        if email.strip()
+    ]
+    if not user_emails:
+        print("USER_EMAIL is not set, no calendar events fetched")
+        return
+
     start_time = datetime.now()
-    end_time = (datetime.now() + timedelta(days=7)).replace(
+    end_time = (start_time + timedelta(days=7)).replace(
         hour=23, minute=59, second=59
     )
 
-    print(f"Fetching calendar events for {user_email}...")
+    print(f"Fetching calendar events for {', '.join(user_emails)}...")
     print(f"Time range: {start_time} to {end_time}\n")
 
-    try:
-        # With structured output
-        events_response = await get_calendar_events(
-            user_email=user_email,
-            start_time=start_time,
-            end_time=end_time,
-        )
-
-        print(events_response)
-        print(f"Found {len(events_response.events)} events:")
-        print(f"Time range: {start_time}-{end_time}\n")
-
-        for i, event in enumerate(events_response.events, 1):
-            print(f"{i}. {event.summary}")
-            print(f"   Time: {event.start_time} to {event.end_time}")
-            if event.location:
-                print(f"   Location: {event.location}")
-            if event.attendees:
-                print(f"   Attendees: {', '.join(event.attendees)}")
-            if event.link:
-                print(f"   Link: {event.link}")
-            print()
-
-    except Exception as e:
-        print(f"Error fetching calendar events: {e}")
-        raise
+    # Each user's calendar is fetched concurrently
+    results = await asyncio.gather(
+        *(
+            get_calendar_events(
+                user_email=user_email,
+                start_time=start_time,
+                end_time=end_time,
+            )
+            for user_email in user_emails
+        ),
+        return_exceptions=True,
+    )
+
+    lines = []
+    failed = False
+    for user_email, events_response in zip(user_emails, results):
+        if isinstance(events_response, Exception):
+            failed = True
+            lines.append(
+                f"Error fetching calendar events for {user_email}: {events_response}\n"
+            )
+        else:
+            lines.extend(format_events(user_email, events_response))
+
+    # Write the whole report at once rather than one print per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":